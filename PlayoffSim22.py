@@ -4,8 +4,7 @@ Created on Thu Feb 16 04:12:26 2023
 
 @author: Stephen Kim
 
-Note: Do not use function addTeamWins more than once. Otherwise teams wins columns
-will be added.
+Note: addTeamWins returns a new dictionary, the one passed in is left unchanged.
 
 10 Team playoff format for years 2016, 2018, 2019, 2021
 Each season can be done one by one, or all at the same time.
@@ -13,20 +12,44 @@ Each season can be done one by one, or all at the same time.
 """
 
 
-from collections import Counter
-import re
-import pandas as pd
-import time
 import numpy as np
-from matplotlib import pyplot as plt
-from statistics import mode
+import batchSim
+import exactSim
+import instrumentation
+import parallelSim
+import scenarioSim
+from seasonData import readPitchers, addWins, extractWAR
+from simResult import SimulationResult
+from seriesTable import SeriesTable
+from PlayoffSimulator import (bracketFor, playSeries, WILD_CARD, DIVISION_SERIES, CHAMPIONSHIP_SERIES,
+                              WORLD_SERIES)
 
 class Baseball():
     
     
-    def __init__(self, nationalLeague, americanLeague):
+    def __init__(self, nationalLeague, americanLeague, bracket = None):
+        '''Takes the nl and al dictionaries of seeds and the playoff format (a PlayoffSimulator),
+        which defaults to the format matching the number of seeds. The batch, parallel and
+        exact engines run any format, simulatePlayoffs only the 12 team format'''
+        
         self.nl = nationalLeague
         self.al = americanLeague
+        self.bracket = bracketFor(self.nl) if bracket is None else bracket
+        
+        with instrumentation.phase('setup'):
+            # Game win probability of every team against every opponent for each pitcher
+            # slot, home and away. Indexed [team][opponent][slot - 1][batchSim.HOME/AWAY]
+            names, strength, wins = batchSim.bracketArrays(self.nl, self.al)
+            self.gameProbs = batchSim.gameProbabilities(strength)
+            
+            # Memoized P(series win) for every pairing, shared by the batch and exact engines
+            self.seriesTable = SeriesTable(self.gameProbs, self.bracket.formats)
+        
+        # Team order used by win counts and by the per-trial champion record
+        self.teamNames = names
+        self.teamIndex = {name: i for i, name in enumerate(names)}
+        self.championRecord = None
+        self.advancement = None
            
     
     def simulateMatchup(self, teamA, teamB,):
@@ -59,6 +82,14 @@ class Baseball():
             return teamB[0], teamB[2]                         
     
     
+    def gameOdds(self, home, away, slot):
+        '''Function that returns the odds of the home team beating the away team (team names)
+        with both teams starting the pitcher of slot, read from the game probability matrix.
+        Same value as the win ratio of simulateMatchup'''
+        
+        return self.gameProbs[self.teamIndex[home], self.teamIndex[away], slot - 1, batchSim.HOME]
+    
+    
     def simulatePlayoffs(self):
         '''Function that simulates each round of the 2022 playoff scenario and returns the World
         Series champion'''
@@ -66,6 +97,9 @@ class Baseball():
         nl = self.nl.copy()
         al = self.al.copy()
         
+        if instrumentation.active is not None:
+            return self.simulatePlayoffsTimed(nl, al)
+        
         nl2, al2 = self.wildCard(nl, al)                     # Simulate wild card round
         nl3, al3 = self.divisionSeries(nl2, al2)             # Simulate divisional series round
         nl4, al4 = self.championshipSeries(nl3, al3)         # Simulate league championship round
@@ -74,67 +108,276 @@ class Baseball():
         return champ
     
     
-    def runSimulation(self, trials = 1000000, season = 2022):
-        '''Function that runs the playoff scenario default 1,000,000 times.
-        Tracks the world series winners and plot results'''
+    def simulatePlayoffsTimed(self, nl, al):
+        '''Function that runs simulatePlayoffs with every round timed by the active recorder
+        (see instrumentation.py). Kept apart so uninstrumented runs pay nothing for it'''
+        
+        with instrumentation.phase('Wild Card'):
+            nl, al = self.wildCard(nl, al)
+        with instrumentation.phase('Division Series'):
+            nl, al = self.divisionSeries(nl, al)
+        with instrumentation.phase('Championship Series'):
+            nl, al = self.championshipSeries(nl, al)
+        with instrumentation.phase('World Series'):
+            return self.worldSeries(nl, al)
+    
+    
+    def simulatePlayoffsLoop(self, trials, record = False):
+        '''Function that simulates the playoff scenario trials times one bracket at a time.
+        Returns the team names, the World Series win count of every team, the
+        int8 array of champion indices of every trial (None unless record is True) and
+        the round advancement counts, which only the batch engine keeps (None)'''
+        
+        index = {name: i for i, name in enumerate(self.teamNames)}
+        counts = np.zeros(len(self.teamNames), dtype = np.int64)
+        champions = np.empty(trials, dtype = np.int8) if record else None
         
-        championData = []
-        teamChamps = []
-
         for i in range(trials):
-            championData.append(self.simulatePlayoffs())
-            #teamChamps.append(championData[i][1])
+            champ = index[self.simulatePlayoffs()]
+            counts[champ] += 1
+            if record:
+                champions[i] = champ
+        
+        instrumentation.count('trials', trials)
+        
+        return self.teamNames, counts, champions, None
+    
+    
+    def simulatePlayoffsBatch(self, trials, seed = None, record = False, antithetic = False,
+                              advancement = False):
+        '''Function that simulates the playoff scenario trials times at once with the
+        vectorized engine. Returns the same as simulatePlayoffsLoop, with the number of
+        times every team reached each round if advancement is True'''
+        
+        return batchSim.simulateBracket(self.nl, self.al, trials, seed, self.seriesTable, record, antithetic,
+                                        self.bracket, advancement)
+    
+    
+    def simulatePlayoffsParallel(self, trials, workers, seed = None, record = False, antithetic = False,
+                                 advancement = False):
+        '''Function that splits the trials over workers processes. Returns the same as
+        simulatePlayoffsBatch, reproducible for a given seed and number of workers'''
+        
+        return parallelSim.simulateParallel(self.nl, self.al, trials, workers, seed, record, antithetic,
+                                            self.bracket, advancement, self.gameProbs)
+    
+    
+    def advancementTable(self, reached, counts, trials):
+        '''Function that takes the round advancement counts and champion counts of a batch
+        run and returns a pandas dataframe of the odds (percent) of every team reaching
+        each round and winning the World Series'''
+
+        import pandas as pd
+        
+        columns = ['Reach {} %'.format(r) for r in self.bracket.advancementRounds()]
+        table = pd.DataFrame(reached.T / trials * 100, index = self.teamNames, columns = columns)
+        table['Win World Series %'] = counts / trials * 100
+        
+        return table
+    
+    
+    def compareScenario(self, other, trials = 1000000, seed = None, antithetic = False):
+        '''Function that takes another Baseball object with the same teams and seeds (for
+        example with a different #1 starter WAR for one team) and simulates both brackets
+        with common random numbers, and antithetic pairs if antithetic is True.
+        Returns a pandas dataframe of the title odds in both scenarios, their difference,
+        the standard error of the difference, and the standard error two independent
+        runs of the same size would have'''
+
+        import pandas as pd
+        
+        names, odds, delta, stdError = scenarioSim.compareScenarios([(self.nl, self.al), (other.nl, other.al)],
+                                                                   trials, seed, antithetic, False, self.bracket,
+                                                                   [self.gameProbs, other.gameProbs])
+        
+        independent = np.sqrt((odds[0] * (1 - odds[0]) + odds[1] * (1 - odds[1])) / trials)
+        
+        return pd.DataFrame({'Base %': odds[0] * 100, 'Scenario %': odds[1] * 100,
+                             'Delta %': delta[1] * 100, 'Std Error %': stdError[1] * 100,
+                             'Independent Std Error %': independent * 100}, index = names)
+    
+    
+    def gameProbabilityTable(self):
+        '''Function that returns a pandas dataframe with one row per entry of the game
+        probability matrix (team, opponent, pitcher slot, home/away, win probability)'''
+
+        import pandas as pd
+        
+        rows = []
+        for t, team in enumerate(self.teamNames):
+            for o, opponent in enumerate(self.teamNames):
+                if t == o:
+                    continue
+                for slot in range(1, self.gameProbs.shape[2] + 1):
+                    rows.append([team, opponent, slot, 'Home', self.gameProbs[t, o, slot - 1, batchSim.HOME]])
+                    rows.append([team, opponent, slot, 'Away', self.gameProbs[t, o, slot - 1, batchSim.AWAY]])
+        
+        return pd.DataFrame(rows, columns = ['Team', 'Opponent', 'Slot', 'Venue', 'Win Probability'])
+    
+    
+    def exportGameProbabilities(self, file):
+        '''Function that writes the game probability matrix to a csv file, or to a NumPy
+        .npy file (raw matrix in team order of self.teamNames) if file ends with .npy'''
         
-        df = pd.DataFrame({'Team':championData})
-        self.plotResults(championData, trials, season)
+        if file.endswith('.npy'):
+            np.save(file, self.gameProbs)
+        else:
+            self.gameProbabilityTable().to_csv(file, index = False)
+    
+    
+    def exactOdds(self):
+        '''Function that returns a dictionary of every playoff team and its exact odds
+        of winning the World Series, computed without simulation'''
         
-        wins = df['Team'].value_counts()
-        self.printResults(wins, trials)
+        return exactSim.championshipOdds(self.nl, self.al, self.seriesTable, self.bracket)
+    
+    
+    def simulate(self, trials = 1000000, season = 2022, batch = True, workers = 1, seed = None,
+                 record = False, precision = None, confidence = 0.95, antithetic = False, cache = None,
+                 files = (), jit = False):
+        '''Function that runs the playoff scenario default 1,000,000 times without printing
+        or plotting anything and returns a SimulationResult.
+        If batch is True, all trials are simulated at once with the vectorized engine.
+        If workers is more than 1, the trials are split over a process pool.
+        
+        If precision is given (confidence interval half width in percentage points, e.g. 0.1),
+        the batch engine runs until every team's title odds reach that precision, with trials
+        as the maximum number of trials. The number of trials used is kept in self.trials.
+        
+        Only a win counter per team is kept. If record is True, the champion of every trial
+        is also kept in self.championRecord as an int8 array of indices into self.teamNames.
+        The batch and parallel engines also count the teams reaching every round in the same
+        pass, the loop only keeps the champions.
+        If antithetic is True, the batch engine simulates trials as antithetic pairs.
+        
+        If cache (a resultCache.ResultCache) is given, the batch engine result is read from
+        or added to the cache, files being the data files the brackets were read from. A
+        cached run draws from streams spawned from the seed, so its counts differ from an
+        uncached run with the same seed, and an unseeded run is not cached.
+        
+        If jit is True, the brackets are simulated with the Numba compiled kernel (see jitSim),
+        or with the batch engine playing every game if Numba is not installed. The kernel
+        is a game by game reference, slower than the batch engine.'''
+        
+        if jit and (cache is not None or precision is not None or record or antithetic or workers > 1):
+            raise ValueError('the compiled kernel runs a fixed number of trials in one process and only '
+                             'keeps counts')
+        
+        if cache is not None:
+            if precision is not None or record or antithetic:
+                raise ValueError('cached runs have a fixed number of trials and only keep counts')
+            with instrumentation.phase('simulate'):
+                result = cache.simulate(self.nl, self.al, trials, seed, self.bracket, season, files, workers,
+                                        self.gameProbs)
+            result.confidence = confidence
+            self.championRecord = None
+            self.trials = trials
+            return result
+        
+        if precision is not None and workers > 1:
+            raise ValueError('precision runs check the intervals between batches and use one process')
+        
+        with instrumentation.phase('simulate'):
+            if precision is not None:
+                names, counts, champions, reached, trials = batchSim.simulateToPrecision(
+                    self.nl, self.al, precision / 100, confidence, trials, seed, self.seriesTable, record,
+                    antithetic, self.bracket, True)
+            elif workers > 1:
+                names, counts, champions, reached = self.simulatePlayoffsParallel(trials, workers, seed, record,
+                                                                                  antithetic, True)
+            elif jit:
+                import jitSim
+                names, counts, champions, reached = jitSim.simulateBracket(self.nl, self.al, trials, seed,
+                                                                           self.bracket, True, self.gameProbs)
+            elif batch:
+                names, counts, champions, reached = self.simulatePlayoffsBatch(trials, seed, record, antithetic,
+                                                                               True)
+            else:
+                names, counts, champions, reached = self.simulatePlayoffsLoop(trials, record)
+        
+        self.championRecord = champions
+        self.trials = trials
+        
+        return SimulationResult(names, counts, trials, season, reached, self.bracket.advancementRounds(),
+                                champions, confidence)
+    
+    
+    def runSimulation(self, trials = 1000000, season = 2022, batch = False, workers = 1,
+                      seed = None, record = False, precision = None, confidence = 0.95,
+                      antithetic = False, plot = True, plotFile = None, cache = None, jit = False):
+        '''Function that runs the playoff scenario default 1,000,000 times.
+        Tracks the world series winners, prints and plot results. Takes the same
+        parameters as simulate.
+        
+        The confidence interval of every team is kept in self.intervals, the odds of reaching
+        every round in self.advancement (see advancementTable, None for the loop).
+        If plotFile is given, the bargraph is written to that file (.png, .svg) with the
+        non-interactive renderer instead of being shown. If plot is False, nothing is plotted.
+        Returns a pandas series of the World Series win count of every team'''
+
+        import pandas as pd
+        
+        result = self.simulate(trials, season, batch, workers, seed, record, precision, confidence,
+                               antithetic, cache, jit = jit)
+        trials = result.trials
+        
+        with instrumentation.phase('aggregation'):
+            self.intervals = result.table()[['Win %', 'Lower %', 'Upper %']]
+            self.advancement = None if result.reached is None else self.advancementTable(result.reached,
+                                                                                           result.counts, trials)
+            
+            wins = pd.Series(result.counts, index = result.names)
+            wins = wins[wins > 0].sort_values(ascending = False)
+        
+        with instrumentation.phase('plotting'):
+            if plotFile is not None:
+                import renderSim
+                renderSim.renderResult(result, plotFile)
+            elif plot:
+                self.plotResults(wins, trials, season)
+        
+        if precision is None:
+            self.printResults(wins, trials)
+        else:
+            self.printResults(wins, trials, result.winProbabilities()[1] * 100)
                         
-        return championData
+        return wins
     
     
-    def plotResults(self, championData, trials, season):
-        '''Function that plots the results in a bargraph'''
+    def plotResults(self, wins, trials, season):
+        '''Function that plots the results (World Series win counts per team) in a bargraph'''
+
+        from matplotlib import pyplot as plt
+        import renderSim
         
-        df = pd.DataFrame({'Team':championData})
         team = []
         pct = []
-        for idx, x in df['Team'].value_counts().items():
+        for idx, x in wins.items():
             
             pct.append(round((x/trials) * 100, 2))
             team.append(idx)
         
         plt.figure(figsize = (10,5))
-
-        plt.bar(team, pct, color = 'green')
-     
-  
-        self.addlabels(team, pct)
-     
-        plt.xticks(rotation = 60)
-        plt.title('Odds of Winning the World Series {} Edition - Pitcher WAR'.format(season))
-        plt.xlabel("Teams")
-        plt.ylabel("Win Percentage")
+        
+        renderSim.drawResults(plt.gca(), team, pct, season)
+        
         plt.rc('font', size = 12)
         plt.show()
-        
-
-    def addlabels(self, x,y):
-        '''Function to add labels and text boxes to barchart'''
-        for i in range(len(x)):
-            plt.text(i, y[i]//2,y[i], ha = 'center',
-                     bbox = dict(boxstyle = 'sawtooth', facecolor = 'yellow', alpha = .6))
     
     
-    def printResults(self, wins, trials):
-        '''Function to print results'''
+    def printResults(self, wins, trials, halfWidth = None):
+        '''Function to print results. halfWidth is an optional array of confidence
+        interval half widths (percentage points) in the team order of self.teamNames'''
         
         print('2022 MLB Playoff Scenario Simulation: {} Trials'.format(trials))
         print()
         
         for idx, x in wins.items():
-            print('Team: {:^22s}     World Series Win %: {:.2f}'.format(idx, (x/trials) * 100))
+            if halfWidth is None:
+                print('Team: {:^22s}     World Series Win %: {:.2f}'.format(idx, (x/trials) * 100))
+            else:
+                print('Team: {:^22s}     World Series Win %: {:.2f} +/- {:.2f}'.format(
+                    idx, (x/trials) * 100, halfWidth[self.teamNames.index(idx)]))
               
         
         return
@@ -143,539 +386,77 @@ class Baseball():
     def wildCard(self, nl, al):
         '''Function that takes a two dictionaries (one for each league) and
         eliminates wild card round losers.
-        Higher seeded team has home team advantage for each game.'''
-                
-        # American League 3/6 matchup
-        # Simulate each game with rotating pitcher and track losing team
-        loser1 = []
-        loser1.append(self.simulateMatchup([3, al[3][1], al[3][0]], [6, al[6][1], al[6][0]])[0])  
-        loser1.append(self.simulateMatchup([3, al[3][2], al[3][0]], [6, al[6][2], al[6][0]])[0]) 
-        loser1.append(self.simulateMatchup([3, al[3][3], al[3][0]], [6, al[6][3], al[6][0]])[0])
-        
-        # Remove the team that has lost the most (Lost best of 3)
-        l1 = mode(loser1)
-        del al[l1]
-                 
-        
-        # American League 4/5 matchup
-        loser2 = []
-        loser2.append(self.simulateMatchup([4, al[4][1], al[4][0]], [5, al[5][1], al[5][0]])[0])  
-        loser2.append(self.simulateMatchup([4, al[4][2], al[4][0]], [5, al[5][2], al[5][0]])[0]) 
-        loser2.append(self.simulateMatchup([4, al[4][3], al[4][0]], [5, al[5][3], al[5][0]])[0])
-        l2 = mode(loser2)
-        del al[l2]
-        
-        # National League 3/6 matchup
-        loser3 = []
-        loser3.append(self.simulateMatchup([3, nl[3][1], nl[3][0]], [6, nl[6][1], nl[6][0]])[0])  
-        loser3.append(self.simulateMatchup([3, nl[3][2], nl[3][0]], [6, nl[6][2], nl[6][0]])[0]) 
-        loser3.append(self.simulateMatchup([3, nl[3][3], nl[3][0]], [6, nl[6][3], nl[6][0]])[0])
-        l3 = mode(loser3)
-        del nl[l3]
-        
-        # National League 4/5 matchup
-        loser4 = []
-        loser4.append(self.simulateMatchup([4, nl[4][1], nl[4][0]], [5, nl[5][1], nl[5][0]])[0])  
-        loser4.append(self.simulateMatchup([4, nl[4][2], nl[4][0]], [5, nl[5][2], nl[5][0]])[0]) 
-        loser4.append(self.simulateMatchup([4, nl[4][3], nl[4][0]], [5, nl[5][3], nl[5][0]])[0])
-        l4 = mode(loser4)
-        del nl[l4]
-        
+        Higher seeded team has home team advantage for each game.
+        All three games are played, the team with the most losses is eliminated.'''
+
+        # American League 3/6 and 4/5 matchups, then National League 3/6 and 4/5
+        for league in (al, nl):
+            for hi, lo in ((3, 6), (4, 5)):
+                l, _ = playSeries(self.simulateMatchup, (hi, league[hi]), (lo, league[lo]), WILD_CARD, 3,
+                                  self.gameOdds)
+                del league[l]
+
         return nl, al
-        
-        
+
+
     def divisionSeries(self, nl, al):
         '''Function that returns the divional round winners in a best of 5 series.
         Higher seed plays home twice, then away twice, then home again if needed.
         Return two dictionaries of the teams left standing in each league'''
-        
-        # American League 1 vs 4/5 matchup
-        loser1 = []
-        
-        # If 4th ranked team is still alive, simulate 1 vs 4 series
-        if 4 in al:                                                     
-            loser1.append(self.simulateMatchup([1, al[1][1], al[1][0]], [4, al[4][1], al[4][0]])[0])  
-            loser1.append(self.simulateMatchup([1, al[1][2], al[1][0]], [4, al[4][2], al[4][0]])[0]) 
-            loser1.append(self.simulateMatchup([4, al[4][3], al[4][0]], [1, al[1][3], al[1][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser1) == 3:
-                l1 = mode(loser1)
-                del al[l1]
-            # Else play game 4
-            else:
-                loser1.append(self.simulateMatchup([4, al[4][1], al[4][0]], [1, al[1][1], al[1][0]])[0])
-                
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser1) == 3:
-                    l1 = mode(loser1)
-                    del al[l1]
-                # Else play game 5
-                else:
-                    loser1.append(self.simulateMatchup([1, al[1][2], al[1][0]], [4, al[4][2], al[4][0]])[0])
-                    l1 = mode(loser1)
-                    del al[l1]
-        
-        # Else if 5th ranked team is still alive, simulate 1 vs 5 series
-        else:                                                           
-            loser1.append(self.simulateMatchup([1, al[1][1], al[1][0]], [5, al[5][1], al[5][0]])[0])  
-            loser1.append(self.simulateMatchup([1, al[1][2], al[1][0]], [5, al[5][2], al[5][0]])[0]) 
-            loser1.append(self.simulateMatchup([5, al[5][3], al[5][0]], [1, al[1][3], al[1][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser1) == 3:
-                l1 = mode(loser1)
-                del al[l1]
-            # Else play game 4
-            else:
-                loser1.append(self.simulateMatchup([5, al[5][1], al[5][0]], [1, al[1][1], al[1][0]])[0])  
-                
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser1) == 3:
-                    l1 = mode(loser1)
-                    del al[l1]
-                # Else play game 5
-                else:
-                    loser1.append(self.simulateMatchup([1, al[1][2], al[1][0]], [5, al[5][2], al[5][0]])[0]) 
-                    l1 = mode(loser1)
-                    del al[l1]                       
-        
-        # American League 2 vs 3/6 matchup
-        loser2 = []
-        
-        # If 3th ranked team is still alive, simulate 2 vs 3 series
-        if 3 in al:                                                     
-            loser2.append(self.simulateMatchup([2, al[2][1], al[2][0]], [3, al[3][1], al[3][0]])[0])  
-            loser2.append(self.simulateMatchup([2, al[2][2], al[2][0]], [3, al[3][2], al[3][0]])[0]) 
-            loser2.append(self.simulateMatchup([3, al[3][3], al[3][0]], [2, al[2][3], al[2][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser2) == 3:
-                l2 = mode(loser2)
-                del al[l2]
-            # Else play game 4
-            else:
-                loser2.append(self.simulateMatchup([3, al[3][1], al[3][0]], [2, al[2][1], al[2][0]])[0])  
-                
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser2) == 3:
-                    l2 = mode(loser2)
-                    del al[l2]
-                # Else play game 5
-                else:
-                    loser2.append(self.simulateMatchup([2, al[2][2], al[2][0]], [3, al[3][2], al[3][0]])[0]) 
-                    l2 = mode(loser2)
-                    del al[l2]
-                    
-        # Else if 6thth ranked team is still alive, simulate 2 vs 6 series
-        else:                                                           
-            loser2.append(self.simulateMatchup([2, al[2][1], al[2][0]], [6, al[6][1], al[6][0]])[0])  
-            loser2.append(self.simulateMatchup([2, al[2][2], al[2][0]], [6, al[6][2], al[6][0]])[0]) 
-            loser2.append(self.simulateMatchup([6, al[6][3], al[6][0]], [2, al[2][3], al[2][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser2) == 3:
-                l2 = mode(loser2)
-                del al[l2]
-            # Else play game 4
-            else:
-                loser2.append(self.simulateMatchup([6, al[6][1], al[6][0]], [2, al[2][1], al[2][0]])[0])  
-            
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser2) == 3:
-                    l2 = mode(loser2)
-                    del al[l2]
-                # Else play game 5
-                else:
-                    loser2.append(self.simulateMatchup([2, al[2][2], al[2][0]], [6, al[6][2], al[6][0]])[0]) 
-                    l2 = mode(loser2)
-                    del al[l2]
-                    
-        
-        # National League 1 vs 4/5 matchup
-        loser3 = []
-        
-        # If 4th ranked team is still alive, simulate 1 vs 4 series
-        if 4 in nl:                                                     
-            loser3.append(self.simulateMatchup([1, nl[1][1], nl[1][0]], [4, nl[4][1], nl[4][0]])[0])  
-            loser3.append(self.simulateMatchup([1, nl[1][2], nl[1][0]], [4, nl[4][2], nl[4][0]])[0]) 
-            loser3.append(self.simulateMatchup([4, nl[4][3], nl[4][0]], [1, nl[1][3], nl[1][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser3) == 3:
-                l3 = mode(loser3)
-                del nl[l3]
-            # Else play game 4
-            else:
-                loser3.append(self.simulateMatchup([4, nl[4][1], nl[4][0]], [1, nl[1][1], nl[1][0]])[0])  
-            
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser3) == 3:
-                    l3 = mode(loser3)
-                    del nl[l3]
-                # Else play game 5
-                else:
-                    loser3.append(self.simulateMatchup([1, nl[1][2], nl[1][0]], [4, nl[4][2], nl[4][0]])[0]) 
-                    l3 = mode(loser3)
-                    del nl[l3]
-                
-        # Else if 5th ranked team is still alive, simulate 1 vs 5 series
-        else:                                                           
-            loser3.append(self.simulateMatchup([1, nl[1][1], nl[1][0]], [5, nl[5][1], nl[5][0]])[0])  
-            loser3.append(self.simulateMatchup([1, nl[1][2], nl[1][0]], [5, nl[5][2], nl[5][0]])[0]) 
-            loser3.append(self.simulateMatchup([5, nl[5][3], nl[5][0]], [1, nl[1][3], nl[1][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser3) == 3:
-                l3 = mode(loser3)
-                del nl[l3]
-            # Else play game 4
-            else:
-                loser3.append(self.simulateMatchup([5, nl[5][1], nl[5][0]], [1, nl[1][1], nl[1][0]])[0])  
-            
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser3) == 3:
-                    l3 = mode(loser3)
-                    del nl[l3]
-                # Else play game 5
-                else:
-                    loser3.append(self.simulateMatchup([1, nl[1][2], nl[1][0]], [5, nl[5][2], nl[5][0]])[0]) 
-                    l3 = mode(loser3)
-                    del nl[l3]
-                    
-        
-        # National League 2 vs 3/6 matchup
-        loser4 = []
-        
-        # If 3th ranked team is still alive, simulate 2 vs 3 series
-        if 3 in nl:                                                     
-            loser4.append(self.simulateMatchup([2, nl[2][1], nl[2][0]], [3, nl[3][1], nl[3][0]])[0])  
-            loser4.append(self.simulateMatchup([2, nl[2][2], nl[2][0]], [3, nl[3][2], nl[3][0]])[0]) 
-            loser4.append(self.simulateMatchup([3, nl[3][3], nl[3][0]], [2, nl[2][3], nl[2][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser4) == 3:
-                l4 = mode(loser4)
-                del nl[l4]
-            # Else play game 4
-            else:
-                loser4.append(self.simulateMatchup([3, nl[3][1], nl[3][0]], [2, nl[2][1], nl[2][0]])[0])  
-            
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser4) == 3:
-                    l4 = mode(loser4)
-                    del nl[l4]
-                # Else play game 5
-                else:
-                    loser4.append(self.simulateMatchup([2, nl[2][2], nl[2][0]], [3, nl[3][2], nl[3][0]])[0]) 
-                    l4 = mode(loser4)
-                    del nl[l4]
-        
-        # Else if 6th ranked team is still alive, simulate 2 vs 6 series
-        else:                                                           
-            loser4.append(self.simulateMatchup([2, nl[2][1], nl[2][0]], [6, nl[6][1], nl[6][0]])[0])  
-            loser4.append(self.simulateMatchup([2, nl[2][2], nl[2][0]], [6, nl[6][2], nl[6][0]])[0]) 
-            loser4.append(self.simulateMatchup([6, nl[6][3], nl[6][0]], [2, nl[2][3], nl[2][0]])[0])
-            
-            # If one team reaches three losses, they are eliminated
-            if self.checkSeries(loser4) == 3:
-                l4 = mode(loser4)
-                del nl[l4]
-            # Else play game 4
-            else:
-                loser4.append(self.simulateMatchup([6, nl[6][1], nl[6][0]], [2, nl[2][1], nl[2][0]])[0])  
-            
-                # If one team reaches three losses they are eliminated
-                if self.checkSeries(loser4) == 3:
-                    l4 = mode(loser4)
-                    del nl[l4]
-                # Else play game 5
-                else:
-                    loser4.append(self.simulateMatchup([2, nl[2][2], nl[2][0]], [6, nl[6][2], nl[6][0]])[0]) 
-                    l4 = mode(loser4)
-                    del nl[l4]
-        
+
+        # American League 1 vs 4/5 and 2 vs 3/6 matchups, then National League
+        for league in (al, nl):
+            for hi, lo in ((1, 4 if 4 in league else 5), (2, 3 if 3 in league else 6)):
+                l, _ = playSeries(self.simulateMatchup, (hi, league[hi]), (lo, league[lo]), DIVISION_SERIES,
+                                  gameOdds = self.gameOdds)
+                del league[l]
+
         return nl, al
-    
-    
+
+
     def championshipSeries(self, nl, al):
         '''Function that returns the league championship winners 2-3-2 series.'''
-        
-        # American League Finals matchup
-        # Get seedings of two AL teams still alive
-        hi1 = min(al)
-        low1 = max(al)
-        
-        loser1 = []
-        
-        # Simulate best of 7 series, track loser of each game, and remove loser                                                   
-        loser1.append(self.simulateMatchup([hi1, al[hi1][1], al[hi1][0]], [low1, al[low1][1], al[low1][0]])[0])  
-        loser1.append(self.simulateMatchup([hi1, al[hi1][2], al[hi1][0]], [low1, al[low1][2], al[low1][0]])[0]) 
-        loser1.append(self.simulateMatchup([low1, al[low1][3], al[low1][0]], [hi1, al[hi1][3], al[hi1][0]])[0])
-        loser1.append(self.simulateMatchup([low1, al[low1][1], al[low1][0]], [hi1, al[hi1][1], al[hi1][0]])[0])
-        
-        # If one team reaches four losses, they are eliminated
-        if self.checkSeries(loser1) == 4:
-            l1 = mode(loser1)
-            del al[l1]
-        # Else play game 4
-        else:
-            loser1.append(self.simulateMatchup([low1, al[low1][2], al[low1][0]], [hi1, al[hi1][2], al[hi1][0]])[0])
-            
-            # If one team reaches four losses, they are eliminated
-            if self.checkSeries(loser1) == 4:
-                l1 = mode(loser1)
-                del al[l1]
-            # Else play game 4
-            else:
-                loser1.append(self.simulateMatchup([hi1, al[hi1][3], al[hi1][0]], [low1, al[low1][3], al[low1][0]])[0])
-                
-                # If one team reaches four losses, they are eliminated
-                if self.checkSeries(loser1) == 4:
-                    l1 = mode(loser1)
-                    del al[l1]
-                # Else play game 4
-                else:
-                    loser1.append(self.simulateMatchup([hi1, al[hi1][1], al[hi1][0]], [low1, al[low1][1], al[low1][0]])[0])  
-                    l1 = mode(loser1)
-                    del al[l1]
-                                           
-            
-        # National League matchup
-        # Get seedings of two AL teams still alive
-        hi2 = min(nl)
-        low2 = max(nl)
-
-        loser2 = []
-        
-        # Simulate best of 7 series, track loser of each game, and remove loser                                                   
-        loser2.append(self.simulateMatchup([hi2, nl[hi2][1], nl[hi2][0]], [low2, nl[low2][1], nl[low2][0]])[0])  
-        loser2.append(self.simulateMatchup([hi2, nl[hi2][2], nl[hi2][0]], [low2, nl[low2][2], nl[low2][0]])[0]) 
-        loser2.append(self.simulateMatchup([low2, nl[low2][3], nl[low2][0]], [hi2, nl[hi2][3], nl[hi2][0]])[0])
-        loser2.append(self.simulateMatchup([low2, nl[low2][1], nl[low2][0]], [hi2, nl[hi2][1], nl[hi2][0]])[0])
-       
-        # If one team reaches four losses, they are eliminated
-        if self.checkSeries(loser2) == 4:
-            l2 = mode(loser2)
-            del nl[l2]
-        # Else play game 4
-        else:
-            loser2.append(self.simulateMatchup([low2, nl[low2][2], nl[low2][0]], [hi2, nl[hi2][2], nl[hi2][0]])[0])
-        
-            # If one team reaches four losses, they are eliminated
-            if self.checkSeries(loser2) == 4:
-                l2 = mode(loser2)
-                del nl[l2]
-            # Else play game 4
-            else:
-                loser2.append(self.simulateMatchup([hi2, nl[hi2][3], nl[hi2][0]], [low2, nl[low2][3], nl[low2][0]])[0])
-        
-                # If one team reaches four losses, they are eliminated
-                if self.checkSeries(loser2) == 4:
-                    l2 = mode(loser2)
-                    del nl[l2]
-                # Else play game 4
-                else:
-                    loser2.append(self.simulateMatchup([hi2, nl[hi2][1], nl[hi2][0]], [low2, nl[low2][1], nl[low2][0]])[0])  
-                    l2 = mode(loser2)
-                    del nl[l2]
-                    
+
+        # American League Finals matchup, then National League
+        # Seedings of the two teams still alive in each league
+        for league in (al, nl):
+            hi = min(league)
+            lo = max(league)
+            l, _ = playSeries(self.simulateMatchup, (hi, league[hi]), (lo, league[lo]), CHAMPIONSHIP_SERIES,
+                              gameOdds = self.gameOdds)
+            del league[l]
+
         return nl, al
-        
-    
-    def worldSeries(self, nl, al):     
+
+
+    def worldSeries(self, nl, al):
         '''Function that returns the world series champion'''
-        
+
         a = list(al.keys())[0]       # Get AL team key
         n = list(nl.keys())[0]       # Get NL team key
-        teams = [nl[n][0], al[a][0]]
-        loser = []
-        
+
         # If NL team had more regular wins, they are home team
         if nl[n][4] > al[a][4]:
-            loser.append(self.simulateMatchup([n, nl[n][1], nl[n][0]], [a, al[a][1], al[a][0]])[1])  
-            loser.append(self.simulateMatchup([n, nl[n][2], nl[n][0]], [a, al[a][2], al[a][0]])[1]) 
-            loser.append(self.simulateMatchup([a, al[a][3], al[a][0]], [n, nl[n][3], nl[n][0]])[1])
-            loser.append(self.simulateMatchup([a, al[a][1], al[a][0]], [n, nl[n][1], nl[n][0]])[1])
-            
-            # If one team reaches four losses, they are eliminated
-            if self.checkSeries(loser) == 4:
-                l = mode(loser)
-                teams.remove(l)
-                return teams[0]
-            # Else play game 4
-            else:
-                loser.append(self.simulateMatchup([a, al[a][2], al[a][0]], [n, nl[n][2], nl[n][0]])[1])
-                
-                # If one team reaches four losses, they are eliminated
-                if self.checkSeries(loser) == 4:
-                    l = mode(loser)
-                    teams.remove(l)
-                    return teams[0]
-                # Else play game 4
-                else:
-                    loser.append(self.simulateMatchup([n, nl[n][3], nl[n][0]], [a, al[a][3], al[a][0]])[1])
-                    # If one team reaches four losses, they are eliminated
-                    if self.checkSeries(loser) == 4:
-                        l = mode(loser)
-                        teams.remove(l)
-                        return teams[0]
-                    # Else play game 4
-                    else:
-                        loser.append(self.simulateMatchup([n, nl[n][1], nl[n][0]], [a, al[a][1], al[a][0]])[1])
-                        l = mode(loser)
-                        teams.remove(l)
-                        return teams[0]
-
-            
-        # Else if AL team had more regular wins, they are home team
+            home, away = (n, nl[n]), (a, al[a])
         else:
-            loser.append(self.simulateMatchup([a, al[a][1], al[a][0]], [n, nl[n][1], nl[n][0]])[1])  
-            loser.append(self.simulateMatchup([a, al[a][2], al[a][0]], [n, nl[n][2], nl[n][0]])[1]) 
-            loser.append(self.simulateMatchup([n, nl[n][3], nl[n][0]], [a, al[a][3], al[a][0]])[1])
-            loser.append(self.simulateMatchup([n, nl[n][1], nl[n][0]], [a, al[a][1], al[a][0]])[1])
-            
-            # If one team reaches four losses, they are eliminated
-            if self.checkSeries(loser) == 4:
-                l = mode(loser)
-                teams.remove(l)
-                return teams[0]
-            # Else play game 4
-            else:
-                loser.append(self.simulateMatchup([n, nl[n][2], nl[n][0]], [a, al[a][2], al[a][0]])[1])
-            
-                # If one team reaches four losses, they are eliminated
-                if self.checkSeries(loser) == 4:
-                    l = mode(loser)
-                    teams.remove(l)
-                    return teams[0]
-                # Else play game 4
-                else:
-                    loser.append(self.simulateMatchup([a, al[a][3], al[a][0]], [n, nl[n][3], nl[n][0]])[1])
-            
-                    # If one team reaches four losses, they are eliminated
-                    if self.checkSeries(loser) == 4:
-                        l = mode(loser)
-                        teams.remove(l)
-                        return teams[0]
-                    # Else play game 4
-                    else:
-                        loser.append(self.simulateMatchup([a, al[a][1], al[a][0]], [n, nl[n][1], nl[n][0]])[1])              
-                        l = mode(loser)
-                        teams.remove(l)
-                        return teams[0]
-                        
-    
-    
-    def checkSeries(self, arr):
-        '''Function that takes array as parameter and returns count of the mode'''
-            
-        data = Counter(arr)               # Create counter object with array
-        
-        return data.most_common(1)[0][1]  # Returns the highest occurring item
-    
-    
-def getPitcherStrength():
-    '''Function that creates a dataframe of the team names, top 3 starting pitchers of every team 
-    ordered by WAR, and the total WAR of the bullpen, and the team regular season wins'''
-    
-    
-
-def getPitcherStrength(file):
-    '''Function that creates a dataframe of the top 3 starting pitchers of every team 
-    ordered by WAR, and the total WAR of the bullpen. Takes a csv text file as parameter.'''
-    
-    # Read file containing pitchers for each team and their WAR
-    # https://www.baseball-reference.com/leagues/majors/2022-team-pitching-staffs.shtml
-    df = pd.read_csv(file)
-    data = np.array(df)
-    
-    # Create dictionary for team pitcher strengths
-    pitchers = {}
-    
-    # Create dictionary for each team 
-    for i in range(len(data)):
-        
-        pitchers[data[i][1]] = extractWAR(data[i])
-     
-    return pitchers
+            home, away = (a, al[a]), (n, nl[n])
 
+        _, loser = playSeries(self.simulateMatchup, home, away, WORLD_SERIES, gameOdds = self.gameOdds)
 
-def extractWAR(arr):
-    '''Function that takes an array of team pitching data and converts the strings
-    to float WAR values and returns a list of the top 3 pitchers sorted and the 
-    total WAR of the bullpen'''
+        return away[1][0] if loser == home[1][0] else home[1][0]
 
-    # Create array for teams and pitching WARs
-    pitchers = []
-    
-    # Get rid of names and parenthesis
-    numbers = re.compile(r'-*\d+\.\d{2}')
-
-    # Get top three starting pitcher WARs
-    for i in range(2, 7):
-        war = numbers.findall(arr[i])
-        #print(war)
-        pitchers.append(float(war[0]))
-    pitchers.sort(reverse = True)
-    del pitchers[4]
-    del pitchers[3]
-    
-    # Add combined bullpen WAR
-    for i in range(7, 11):
-        bp = []
-        war = numbers.findall(arr[i])
-        bp.append(float(war[0]))
-    bullpen = np.array(bp)
-    mb = np.mean(bullpen)
-    #print(mb)
-    # Combine mean of bullpen WAR with each pitcher WAR
-    pitchers = pitchers + mb
-    p = list(np.round(pitchers, decimals = 2))
-    
-    #print(pitchers + mb)
 
-    # Add team name to beginning of list
-    p.insert(0, arr[1])    
+def getPitcherStrength(file):
+    '''Function that creates a dictionary of the top 3 starting pitchers of every team 
+    ordered by WAR, each plus the mean WAR of the bullpen. Takes a csv text file as parameter
+    (see seasonData.readPitchers).'''
     
-    # Add team win total to end of list
-    #p.append(arr[-1])
+    # https://www.baseball-reference.com/leagues/majors/2022-team-pitching-staffs.shtml
+    return readPitchers(file).teams()
 
-    return p
 
 def addTeamWins(teamDict, file):
-    '''Function that adds regular season win totals to dictionary of teams'''
-
-    df = pd.read_csv(file)
-    data = np.array(df)
-    
-    for i in data:
-        teamDict[i[0]].append(i[1])
-        
-    return teamDict
-
-
-# Create dictionary of teams, team wins, and pitcher strengths for every year
-ps2022 = getPitcherStrength('2022TeamPitchers.txt')    
-
-# Add regular season wins to each team
-d22 = addTeamWins(ps2022, '2022TeamWins.txt')  
-
-    
-# Recreate 2022 Postseason brackets
-nl22 = {1: ps2022['Los Angeles Dodgers'], 2: ps2022['Atlanta Braves'],
-        3: ps2022['St. Louis Cardinals'], 4: ps2022['New York Mets'], 
-        5: ps2022['San Diego Padres'], 6: ps2022['Philadelphia Phillies (RU)']} 
-
-al22 = {1: ps2022['Houston Astros (W)'], 2: ps2022['New York Yankees'],
-        3: ps2022['Cleveland Guardians'], 4: ps2022['Toronto Blue Jays'],
-        5: ps2022['Seattle Mariners'], 6: ps2022['Tampa Bay Rays']} 
-
-
-# Create baseball simulation object and run simulation for 2022, tracking time
-b22 = Baseball(nl22, al22)
-start_time = time.time()
-results = b22.runSimulation(1000000, 2022)
-print()
-print("Unbatched: %s seconds" % (time.time() - start_time))
+    '''Function that returns a new dictionary of teams with their regular season win totals
+    added. teamDict is not changed (see seasonData.addWins)'''
 
+    return addWins(teamDict, file)
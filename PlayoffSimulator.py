@@ -5,13 +5,135 @@ Created on Mon Mar 20 03:52:15 2023
 @author: Stephen
 """
 
-class PlayoffSimulator:
-    '''Base class to create any kind of playoff simulator'''
+import numpy as np
+import instrumentation
+from TournamentSimulator import TournamentSimulator, seed, winner
 
-    def __init__(self):
-        pass
 
+# Each series format is (home pattern, pitcher rotation). The home pattern is
+# True when the higher seed is the home team, the rotation is the pitcher slot
+# (1 - 3) used by both teams in that game. Mirrors the game order in PlayoffSim22.
+ONE_GAME = ((True,), (1,))
+WILD_CARD = ((True, True, True), (1, 2, 3))
+DIVISION_SERIES = ((True, True, False, False, True), (1, 2, 3, 1, 2))
+CHAMPIONSHIP_SERIES = ((True, True, False, False, False, True, True), (1, 2, 3, 1, 2, 3, 1))
+WORLD_SERIES = CHAMPIONSHIP_SERIES
 
-    def SimulateMatchup(self):
-        '''Function to simulate one game'''
-        pass
\ No newline at end of file
+
+class PlayoffSimulator(TournamentSimulator):
+    '''Base class to create any kind of playoff simulator.
+
+    Both leagues play the same tournament (see TournamentSimulator) and the two league
+    champions meet in the final. The team with more regular season wins is home team
+    of the final, the AL team on ties.'''
+
+    def __init__(self, name, seeds, rounds, final = WORLD_SERIES):
+        self.final = final
+
+        super().__init__(name, seeds, rounds)
+
+        if final not in self.formats:
+            self.formats.append(final)
+        self.finalFormat = self.formats.index(final)
+
+
+    def advancementRounds(self):
+        '''Function that returns the name of every round a team can reach, in the row order
+        of the advancement counts of the batch engine: the rounds of the league tournament,
+        then the World Series'''
+
+        return [roundName for roundName, series, matchups in self.rounds] + ['World Series']
+
+
+# 10 team format (2012 - 2019, 2021): one game wild card between seeds 4 and 5
+TEN_TEAM = PlayoffSimulator('10 team', 5, [
+    ('Wild Card', ONE_GAME, [('WC', seed(4), seed(5))]),
+    ('Division Series', DIVISION_SERIES, [('DS1', seed(1), winner('WC')),
+                                          ('DS2', seed(2), seed(3))]),
+    ('Championship Series', CHAMPIONSHIP_SERIES, [('CS', winner('DS1'), winner('DS2'))])])
+
+# 12 team format (2022 onward): seeds 1 and 2 have a bye, no reseeding
+TWELVE_TEAM = PlayoffSimulator('12 team', 6, [
+    ('Wild Card', WILD_CARD, [('WC36', seed(3), seed(6)),
+                              ('WC45', seed(4), seed(5))]),
+    ('Division Series', DIVISION_SERIES, [('DS1', seed(1), winner('WC45')),
+                                          ('DS2', seed(2), winner('WC36'))]),
+    ('Championship Series', CHAMPIONSHIP_SERIES, [('CS', winner('DS1'), winner('DS2'))])])
+
+# 16 team format (2020): eight seeds per league, best of 3 wild card series
+SIXTEEN_TEAM = PlayoffSimulator('16 team', 8, [
+    ('Wild Card', WILD_CARD, [('WC18', seed(1), seed(8)),
+                              ('WC27', seed(2), seed(7)),
+                              ('WC36', seed(3), seed(6)),
+                              ('WC45', seed(4), seed(5))]),
+    ('Division Series', DIVISION_SERIES, [('DS1', winner('WC18'), winner('WC45')),
+                                          ('DS2', winner('WC27'), winner('WC36'))]),
+    ('Championship Series', CHAMPIONSHIP_SERIES, [('CS', winner('DS1'), winner('DS2'))])])
+
+
+def playSeries(simulateMatchup, hi, lo, series, minGames = 0, gameOdds = None):
+    '''Function that plays one series game by game with simulateMatchup (see
+    Baseball.simulateMatchup) and returns the loser of the series as (seed, name).
+    If gameOdds is given, it is called as gameOdds(home name, away name, slot) and returns
+    the odds of the home team winning (see Baseball.gameOdds), which replaces
+    simulateMatchup. Both draw one np.random.uniform per game the same way.
+
+    hi and lo are (seed, [name, p1, p2, p3, ...]) pairs of the two teams. hi is the home
+    team when the home pattern of the series format is True, and both teams start the
+    pitcher of the rotation slot. Losses are counted per side and the series stops as
+    soon as one side has lost (games // 2) + 1 games, but not before minGames games have
+    been played. Every game draws one random number, in the same order as the
+    hand-written series did, so outcomes are unchanged for a fixed random stream.'''
+
+    homePattern, rotation = series
+    need = len(rotation) // 2 + 1
+
+    hiSeed, hiTeam = hi
+    loSeed, loTeam = lo
+    hiLosses = 0
+    loLosses = 0
+
+    for g in range(len(rotation)):
+        if gameOdds is not None:
+            home, away = (hiTeam, loTeam) if homePattern[g] else (loTeam, hiTeam)
+
+            # Home team loses if the random number is greater than its odds of winning
+            loser = home[0] if np.random.uniform(0, 1) > gameOdds(home[0], away[0], rotation[g]) else away[0]
+
+        else:
+            a = [hiSeed, hiTeam[rotation[g]], hiTeam[0]]
+            b = [loSeed, loTeam[rotation[g]], loTeam[0]]
+
+            # simulateMatchup takes the home team first and returns the loser
+            if homePattern[g]:
+                loser = simulateMatchup(a, b)[1]
+            else:
+                loser = simulateMatchup(b, a)[1]
+
+        if loser == hiTeam[0]:
+            hiLosses += 1
+        else:
+            loLosses += 1
+
+        if g + 1 >= minGames and (hiLosses == need or loLosses == need):
+            break
+
+    if instrumentation.active is not None:
+        instrumentation.count('series')
+        instrumentation.count('games', g + 1)
+        instrumentation.count('rng draws', g + 1)
+
+    if hiLosses > loLosses:
+        return hiSeed, hiTeam[0]
+
+    return loSeed, loTeam[0]
+
+
+# Playoff format by number of seeds per league
+BRACKETS = {5: TEN_TEAM, 6: TWELVE_TEAM, 8: SIXTEEN_TEAM}
+
+
+def bracketFor(league):
+    '''Function that returns the playoff format matching a league dictionary of seeds'''
+
+    return BRACKETS[len(league)]
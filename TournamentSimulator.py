@@ -5,13 +5,99 @@ Created on Mon Mar 20 03:52:15 2023
 @author: Stephen
 """
 
+import numpy as np
+
+
+# Operations of a compiled execution plan
+SERIES = 0          # Play a series between two slots and write the winner to a new slot
+RESEED = 1          # Sort a block of slots by seed into new slots
+
+
+def seed(s):
+    '''Entrant of a series: the team with seed s'''
+    return ('seed', s)
+
+
+def winner(name):
+    '''Entrant of a series: the winner of the series called name'''
+    return ('winner', name)
+
+
+def ranked(r):
+    '''Entrant of a series: the r-th best seed (1 = best) among the winners of the
+    previous round, used for rounds that reseed'''
+    return ('ranked', r)
+
+
 class TournamentSimulator:
-    '''Base class to create any kind of playoff simulator'''
+    '''Base class to create any kind of playoff simulator.
+
+    A tournament is declared with its number of seeds and a list of rounds.
+    Each round is (round name, series format, [(series name, entrant, entrant), ...]),
+    where a series format is (home pattern, pitcher rotation) and an entrant is
+    seed(s), winner(series name) or ranked(r). Seeds that do not play in a round have
+    a bye. The higher seed of every series is home team when the home pattern is True.
+
+    The declaration is compiled into an execution plan: one slot per seed, followed by
+    one slot for the winner of every series, and an integer array of steps
+    (operation, format index, slot a, slot b, output slot, round index).'''
+
+    def __init__(self, name, seeds, rounds):
+        self.name = name
+        self.seeds = seeds
+        self.rounds = rounds
+
+        self.compile()
+
+
+    def compile(self):
+        '''Function that compiles the rounds into the execution plan'''
+
+        self.formats = []
+        steps = []
+
+        winners = {}                        # Slot of the winner of every series
+        slots = self.seeds                  # Slots 0 to seeds - 1 hold the seeds
+        previous = []                       # Winner slots of the previous round
+
+        for r, (roundName, series, matchups) in enumerate(self.rounds):
+            if series not in self.formats:
+                self.formats.append(series)
+
+            # Sort the winners of the previous round by seed if the round reseeds
+            rankedSlots = None
+            if any(entrant[0] == 'ranked' for matchup in matchups for entrant in matchup[1:]):
+                if not previous:
+                    raise ValueError('Round {} reseeds but has no previous round'.format(roundName))
+                steps.append((RESEED, 0, previous[0], len(previous), slots, r))
+                rankedSlots = slots
+                slots += len(previous)
+
+            current = []
+            for seriesName, a, b in matchups:
+                steps.append((SERIES, self.formats.index(series), self.resolve(a, winners, rankedSlots),
+                              self.resolve(b, winners, rankedSlots), slots, r))
+                winners[seriesName] = slots
+                current.append(slots)
+                slots += 1
+
+            previous = current
+
+        self.steps = np.array(steps, dtype = np.intp)
+        self.slots = slots
+        self.champion = slots - 1           # Winner of the last series played
+
+
+    def resolve(self, entrant, winners, rankedSlots):
+        '''Function that returns the slot holding an entrant'''
 
-    def __init__(self):
-        pass
+        kind, value = entrant
 
+        if kind == 'seed':
+            return value - 1
+        if kind == 'winner':
+            return winners[value]
+        if kind == 'ranked' and rankedSlots is not None:
+            return rankedSlots + value - 1
 
-    def SimulateMatchup(self):
-        '''Function to simulate one game'''
-        pass
\ No newline at end of file
+        raise ValueError('Unknown entrant {}'.format(entrant))
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized playoff engine.
+
+Instead of simulating one bracket at a time, every bracket of a batch is
+simulated at once. Per-game uniforms, series wins and the seeds advancing
+out of each round are held as NumPy arrays across the trial axis. The rounds
+come from the compiled execution plan of a PlayoffSimulator format, so one
+kernel runs the 10, 12 and 16 team formats. The teams playing in every round
+can be counted in the same pass, giving the odds of reaching each round.
+
+Teams are referred to by index: NL seeds come first (index = seed - 1),
+followed by the AL seeds (index = number of NL teams + seed - 1).
+"""
+
+import time
+import numpy as np
+import instrumentation
+from TournamentSimulator import SERIES
+from PlayoffSimulator import bracketFor
+
+# Last axis of the game probability matrix
+HOME = 0
+AWAY = 1
+
+# Home field advantage, percent of the total power in a game (see homeWinRatio)
+HOME_ADVANTAGE = 5
+
+# Number of brackets simulated per chunk, keeps the uniforms at a few MB
+CHUNK_SIZE = 250000
+
+# Number of brackets simulated between two precision checks of an adaptive run
+PRECISION_BATCH = 100000
+
+
+def bracketArrays(nl, al):
+    '''Function that takes the nl and al bracket dictionaries ({seed: [name, p1, p2, p3, wins]})
+    and returns the list of team names, an array of pitcher strengths with shape
+    (teams, 3) and an array of regular season wins'''
+
+    teams = [nl[s] for s in sorted(nl)] + [al[s] for s in sorted(al)]
+
+    names = [t[0] for t in teams]
+    strength = np.array([t[1:4] for t in teams], dtype = np.float64)
+    wins = np.array([t[4] for t in teams], dtype = np.float64)
+
+    return names, strength, wins
+
+
+def homeWinRatio(home, away):
+    '''Function that returns the odds of the home team winning a game. Same formula
+    as Baseball.simulateMatchup, works on scalars or arrays'''
+
+    adv = ((home + away)/100) * HOME_ADVANTAGE  # Home field advantage is 5% of total power in game
+    A = home + adv                              # Add home field advantage
+    B = away - adv                              # Subtract away team disadvantage
+
+    return A/(A + B)
+
+
+def gameProbabilities(strength):
+    '''Function that takes the (teams, 3) array of pitcher strengths and returns a
+    (teams, teams, 3, 2) array of game win probabilities. Entry [t][o][slot - 1][HOME]
+    is the odds of team t beating team o at home when both teams start their pitcher
+    in that slot, entry [t][o][slot - 1][AWAY] the odds of t beating o on the road'''
+
+    team = strength[:, None, :]
+    opponent = strength[None, :, :]
+
+    probs = np.empty((len(strength), len(strength), strength.shape[1], 2))
+    probs[..., HOME] = homeWinRatio(team, opponent)
+    probs[..., AWAY] = 1 - homeWinRatio(opponent, team)
+
+    # Negative WAR can push the ratio outside [0, 1]. simulateMatchup then always picks
+    # the same winner, which is what a probability clipped to [0, 1] gives
+    return np.clip(probs, 0, 1)
+
+
+def playSeries(probs, hi, lo, series, rng):
+    '''Function that plays one series for every trial in the batch.
+    hi and lo are arrays of team indices for the higher and lower seed, game odds are
+    looked up in the game probability matrix probs.
+    Returns an array with the index of the series winner of every trial'''
+
+    homePattern, rotation = series
+    games = len(rotation)
+
+    u = rng.random((len(hi), games))            # One uniform per game per trial
+    hiWins = np.zeros(len(hi), dtype = np.int8)
+
+    for g in range(games):
+        venue = HOME if homePattern[g] else AWAY
+        hiWins += u[:, g] < probs[hi, lo, rotation[g] - 1, venue]
+
+    # Playing every game and taking the majority gives the same winner as
+    # stopping once one team has won (games // 2) + 1
+    return np.where(hiWins > games // 2, hi, lo)
+
+
+def leagueChampions(play, bracket, offset, n, reached = None, keep = None):
+    '''Function that runs the execution plan of the bracket for one league over n trials
+    and returns the index of each pennant winner.
+    play(hi, lo, series) returns the winners of one series for every trial.
+    If reached (an int64 array of shape (rounds + 1, teams)) is given, both teams of every
+    series played in round r of the first keep trials (all if None) are counted in reached[r]'''
+
+    recorder = instrumentation.active
+
+    # One row per slot of the plan, seeds first
+    state = np.empty((bracket.slots, n), dtype = np.intp)
+    state[:bracket.seeds] = offset + np.arange(bracket.seeds)[:, None]
+
+    for op, fmt, a, b, out, r in bracket.steps:
+        if recorder is not None:
+            start = time.perf_counter()
+
+        if op == SERIES:
+            # Lower team index is the higher seed
+            hi = np.minimum(state[a], state[b])
+            lo = np.maximum(state[a], state[b])
+            state[out] = play(hi, lo, bracket.formats[fmt])
+
+            if reached is not None:
+                reached[r] += np.bincount(hi[:keep], minlength = reached.shape[1])
+                reached[r] += np.bincount(lo[:keep], minlength = reached.shape[1])
+        else:
+            # Reseed: sort the b slots starting at a by seed
+            state[out:out + b] = np.sort(state[a:a + b], axis = 0)
+
+        if recorder is not None:
+            recorder.addTime(bracket.rounds[r][0], time.perf_counter() - start)
+
+    return state[bracket.champion]
+
+
+def simulateChunk(play, bracket, wins, nTeams, n, reached = None, keep = None):
+    '''Function that simulates n full brackets and returns the champion index of each.
+    If reached is given, the teams reaching every round of the first keep trials (all if
+    None) are counted in it, the last row counting the pennant winners (see leagueChampions)'''
+
+    nlChamp = leagueChampions(play, bracket, 0, n, reached, keep)
+    alChamp = leagueChampions(play, bracket, nTeams, n, reached, keep)
+
+    if reached is not None:
+        reached[-1] += np.bincount(nlChamp[:keep], minlength = reached.shape[1])
+        reached[-1] += np.bincount(alChamp[:keep], minlength = reached.shape[1])
+
+    # Team with more regular season wins is home team, AL on ties
+    nlHome = wins[nlChamp] > wins[alChamp]
+    home = np.where(nlHome, nlChamp, alChamp)
+    away = np.where(nlHome, alChamp, nlChamp)
+
+    with instrumentation.phase('World Series'):
+        return play(home, away, bracket.final)
+
+
+class AntitheticGenerator():
+    '''Random generator that returns 1 - u for every uniform u drawn by a NumPy generator
+    created from the same seed. A bracket simulated with it is the antithetic twin of the
+    bracket simulated with np.random.default_rng(seed)'''
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+
+    def random(self, size = None):
+        return 1 - self.rng.random(size)
+
+
+def makePlay(probs, table, rng):
+    '''Function that returns play(hi, lo, series), which plays one series for every trial
+    using rng. Every series is drawn with one uniform from table if one is given,
+    otherwise every game is played with the game probability matrix probs.
+    While instrumentation is active, the series, games and uniforms drawn are counted'''
+
+    if table is None:
+        def play(hi, lo, series):
+            return playSeries(probs, hi, lo, series, rng)
+    else:
+        def play(hi, lo, series):
+            return table.playSeries(hi, lo, series, rng)
+
+    if instrumentation.active is None:
+        return play
+
+    def countedPlay(hi, lo, series):
+        games = len(hi) * len(series[1])
+        instrumentation.count('series', len(hi))
+        instrumentation.count('rng draws', games if table is None else len(hi))
+        if table is None:
+            instrumentation.count('games', games)
+        return play(hi, lo, series)
+
+    return countedPlay
+
+
+def chunkSeed(rng):
+    '''Function that draws the seed of one chunk from the main generator. Replaying a
+    chunk seed gives the same uniforms, which is used for antithetic pairs and for common
+    random numbers across scenarios'''
+
+    return int(rng.integers(2**63))
+
+
+def simulateBracket(nl, al, trials, seed = None, table = None, record = False, antithetic = False,
+                    bracket = None, advancement = False):
+    '''Function that simulates the playoff bracket trials times and returns the list of
+    team names and an array with the World Series win count of every team.
+    If record is True, an int8 array holding the champion index of every trial is
+    also returned (None otherwise), so memory only grows with trials on request.
+    If advancement is True, an int64 array of shape (rounds + 1, teams) counting how often
+    every team reached each round (see PlayoffSimulator.advancementRounds) is also
+    returned (None otherwise). It is counted from the same brackets as the champions.
+    If a SeriesTable is given, every series is drawn with one uniform from its
+    memoized win probability, otherwise every game is played.
+    If antithetic is True, every chunk is simulated as pairs of brackets, the second
+    of each pair using 1 - u for every uniform u of the first.
+    The playoff format (a PlayoffSimulator) defaults to the one matching the number of seeds'''
+
+    if bracket is None:
+        bracket = bracketFor(nl)
+
+    names, strength, wins = bracketArrays(nl, al)
+    probs = gameProbabilities(strength) if table is None else None
+    rng = np.random.default_rng(seed)
+
+    counts = np.zeros(len(names), dtype = np.int64)
+    champions = np.empty(trials, dtype = np.int8) if record else None
+    reached = np.zeros((len(bracket.rounds) + 1, len(names)), dtype = np.int64) if advancement else None
+
+    for start in range(0, trials, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, trials - start)
+
+        if antithetic:
+            pairs = (n + 1) // 2
+            s = chunkSeed(rng)
+            first = simulateChunk(makePlay(probs, table, np.random.default_rng(s)), bracket, wins, len(nl), pairs,
+                                  reached)
+
+            # The last twin is dropped when n is odd, so it is not counted either
+            twin = simulateChunk(makePlay(probs, table, AntitheticGenerator(s)), bracket, wins, len(nl), pairs,
+                                 reached, n - pairs)
+            chunk = np.concatenate([first, twin])[:n]
+        else:
+            chunk = simulateChunk(makePlay(probs, table, rng), bracket, wins, len(nl), n, reached)
+
+        with instrumentation.phase('aggregation'):
+            counts += np.bincount(chunk, minlength = len(names))
+            if record:
+                champions[start:start + n] = chunk
+        instrumentation.count('trials', n)
+
+    return names, counts, champions, reached
+
+
+def confidenceIntervals(counts, trials, confidence = 0.95):
+    '''Function that takes the champion counts and number of trials and returns the
+    win probability and the confidence interval half width of every team
+    (normal approximation of the binomial)'''
+
+    from statistics import NormalDist
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = counts / trials
+
+    return p, z * np.sqrt(p * (1 - p) / trials)
+
+
+def simulateToPrecision(nl, al, halfWidth, confidence = 0.95, maxTrials = 100000000,
+                        seed = None, table = None, record = False, antithetic = False,
+                        bracket = None, advancement = False):
+    '''Function that simulates the bracket in batches of PRECISION_BATCH trials and stops
+    as soon as the confidence interval half width of every team's title odds is at most
+    halfWidth (a probability, 0.001 = 0.1 percentage points), or maxTrials is reached.
+    Returns the team names, champion counts, per-trial record (None unless record is
+    True), round advancement counts (None unless advancement is True) and the number
+    of trials used'''
+
+    if maxTrials <= 0:
+        raise ValueError('maxTrials must be positive, got {}'.format(maxTrials))
+
+    rng = np.random.default_rng(seed)
+    trials = 0
+    records = []
+
+    while trials < maxTrials:
+        n = min(PRECISION_BATCH, maxTrials - trials)
+
+        # Passing the generator keeps one random stream across batches
+        names, batchCounts, champions, batchReached = simulateBracket(nl, al, n, rng, table, record, antithetic,
+                                                                      bracket, advancement)
+        counts = batchCounts if trials == 0 else counts + batchCounts
+        reached = batchReached if trials == 0 or not advancement else reached + batchReached
+        trials += n
+
+        if record:
+            records.append(champions)
+
+        p, width = confidenceIntervals(counts, trials, confidence)
+        if width.max() <= halfWidth:
+            break
+
+    champions = np.concatenate(records) if record else None
+
+    return names, counts, champions, reached, trials
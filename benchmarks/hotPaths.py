@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the hot paths of the simulators.
+
+Every benchmark runs a fixed, seeded workload until it has taken at least
+--min-time seconds, keeps the best of --repeat runs and reports operations per
+second (games, series rounds, brackets, trials or files, see the Unit column).
+Results are compared with the baselines kept in baselines.json and the run fails
+if a benchmark is slower than the baseline by more than --tolerance.
+
+    python benchmarks/hotPaths.py                   # compare with the baseline
+    python benchmarks/hotPaths.py --save            # store the current results as the baseline
+    python benchmarks/hotPaths.py --filter series   # only benchmarks whose name contains 'series'
+
+The eloSim benchmarks need eloSimulation.py, parseText.py and a Retrosheet game
+log (stats-2022.txt), they are skipped when those are missing.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from importTime import loadBaselines, saveBaselines
+
+
+SEED = 2022
+
+
+class Skip(Exception):
+    '''Raised by the setup of a benchmark that cannot run here'''
+
+
+def bracket2022():
+    '''Function that returns the 2022 nl and al dictionaries of seeds'''
+
+    import seasons
+
+    return seasons.loadBracket(2022, ROOT)
+
+
+def copies(nl, al):
+    '''Function that returns fresh copies of the bracket dictionaries, the series rounds of
+    the loop engine delete the losers from them'''
+
+    return nl.copy(), al.copy()
+
+
+def benchSimulateMatchup():
+    from PlayoffSim22 import Baseball
+
+    nl, al = bracket2022()
+    b = Baseball(nl, al)
+    home = [1, nl[1][1], nl[1][0]]
+    away = [4, nl[4][1], nl[4][0]]
+
+    def run():
+        for i in range(1000):
+            b.simulateMatchup(home, away)
+
+    return run, 1000, 'games'
+
+
+def benchRound(name):
+    '''Function that returns the benchmark of one series round of the loop engine, played
+    on the teams left by the previous rounds'''
+
+    def bench():
+        from PlayoffSim22 import Baseball
+
+        nl, al = bracket2022()
+        b = Baseball(nl, al)
+        rounds = ['wildCard', 'divisionSeries', 'championshipSeries', 'worldSeries']
+
+        # Teams left before the round, the same for every call
+        np.random.seed(SEED)
+        nlLeft, alLeft = copies(nl, al)
+        for previous in rounds[:rounds.index(name)]:
+            nlLeft, alLeft = getattr(b, previous)(nlLeft, alLeft)
+
+        play = getattr(b, name)
+
+        def run():
+            for i in range(200):
+                play(*copies(nlLeft, alLeft))
+
+        return run, 200, 'rounds'
+
+    return bench
+
+
+def benchSimulatePlayoffs():
+    from PlayoffSim22 import Baseball
+
+    b = Baseball(*bracket2022())
+
+    def run():
+        for i in range(200):
+            b.simulatePlayoffs()
+
+    return run, 200, 'brackets'
+
+
+def benchRunSimulation(trials, batch):
+    '''Function that returns the benchmark of runSimulation with trials trials, without the
+    plot and with the printout discarded'''
+
+    def bench():
+        from PlayoffSim22 import Baseball
+
+        b = Baseball(*bracket2022())
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                b.runSimulation(trials, 2022, batch = batch, seed = SEED, plot = False)
+
+        return run, trials, 'trials'
+
+    return bench
+
+
+def benchGetPitcherStrength():
+    from PlayoffSim22 import getPitcherStrength
+
+    file = os.path.join(ROOT, '2022TeamPitchers.txt')
+
+    def run():
+        getPitcherStrength(file)
+
+    return run, 1, 'files'
+
+
+def benchLoadSeason():
+    import seasons
+    import seasonData
+
+    files = seasons.seasonFiles(2022, ROOT)
+
+    def run():
+        seasonData.loadSeason(*files).teams()
+
+    return run, 1, 'seasons'
+
+
+def benchOpenBundle():
+    import seasonBundle
+
+    seasonBundle.openBundle(ROOT)
+
+    def run():
+        seasonBundle.openBundle(ROOT, check = False).teams(2022)
+
+    return run, 1, 'seasons'
+
+
+def benchExtractWAR():
+    import pandas as pd
+    from PlayoffSim22 import extractWAR
+
+    rows = np.array(pd.read_csv(os.path.join(ROOT, '2022TeamPitchers.txt')))
+
+    def run():
+        for row in rows:
+            extractWAR(row)
+
+    return run, len(rows), 'teams'
+
+
+def benchSimulateSeasons(trials):
+    '''Function that returns the benchmark of the vectorized Elo engine simulating trials
+    regular seasons'''
+
+    def bench():
+        import eloSeason
+        from teamRegistry import CODES
+
+        # 162 game season of random pairings (no game log needed), the 2022 preseason ratings
+        rng = np.random.default_rng(SEED)
+        games = [rng.choice(len(CODES), 2, replace = False) for g in range(2430)]
+        schedule = np.array([g[0] for g in games]), np.array([g[1] for g in games])
+        ratings = dict(zip(CODES, rng.normal(1500, 40, len(CODES))))
+
+        def run():
+            for chunk in eloSeason.seasonChunks(schedule, ratings, trials, SEED):
+                pass
+
+        return run, trials, 'seasons'
+
+    return bench
+
+
+def benchRunManySeasons():
+    statFile = os.path.join(ROOT, 'stats-2022.txt')
+
+    try:
+        import eloSimulation
+        import parseText
+        import fullSim
+    except ImportError as e:
+        raise Skip(str(e))
+    if not os.path.exists(statFile):
+        raise Skip('no game log {}'.format(statFile))
+
+    stats = parseText.parseTextFile(statFile)
+    sim = eloSimulation.eloSim(fullSim.teamELO2022)
+
+    def run():
+        np.random.seed(SEED)
+        sim.runManySeasons(10, stats, dict(fullSim.teamELO2022), {key: 0 for key in fullSim.teamELO2022})
+
+    return run, 10, 'seasons'
+
+
+# (name, setup) of every benchmark, setup returns (callable, operations per call, unit)
+BENCHMARKS = [
+    ('Baseball.simulateMatchup', benchSimulateMatchup),
+    ('Baseball.wildCard', benchRound('wildCard')),
+    ('Baseball.divisionSeries', benchRound('divisionSeries')),
+    ('Baseball.championshipSeries', benchRound('championshipSeries')),
+    ('Baseball.worldSeries', benchRound('worldSeries')),
+    ('Baseball.simulatePlayoffs', benchSimulatePlayoffs),
+    ('runSimulation loop 1,000', benchRunSimulation(1000, False)),
+    ('runSimulation loop 10,000', benchRunSimulation(10000, False)),
+    ('runSimulation batch 10,000', benchRunSimulation(10000, True)),
+    ('runSimulation batch 100,000', benchRunSimulation(100000, True)),
+    ('runSimulation batch 1,000,000', benchRunSimulation(1000000, True)),
+    ('getPitcherStrength', benchGetPitcherStrength),
+    ('seasonData.loadSeason', benchLoadSeason),
+    ('seasonBundle.openBundle', benchOpenBundle),
+    ('extractWAR', benchExtractWAR),
+    ('eloSim.runManySeasons', benchRunManySeasons),
+    ('eloSeason.simulateSeasons 1,000', benchSimulateSeasons(1000)),
+    ('eloSeason.simulateSeasons 10,000', benchSimulateSeasons(10000)),
+]
+
+
+def measure(run, minTime = 0.2, repeat = 5):
+    '''Function that returns the best time (seconds) of one call of run, over repeat
+    measurements of as many calls as fit in minTime'''
+
+    np.random.seed(SEED)
+    run()                                       # Warm up caches and lazy imports
+
+    best = None
+    for r in range(repeat):
+        np.random.seed(SEED)
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= minTime:
+                break
+        best = elapsed / calls if best is None else min(best, elapsed / calls)
+
+    return best
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Benchmarks of the simulator hot paths')
+    parser.add_argument('--filter', default = '', help = 'only run benchmarks whose name contains this')
+    parser.add_argument('--min-time', type = float, default = 0.2, help = 'seconds per measurement')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'measurements per benchmark')
+    parser.add_argument('--tolerance', type = float, default = 0.5,
+                        help = 'allowed slowdown over the baseline (0.5 = 50%%)')
+    parser.add_argument('--save', action = 'store_true', help = 'store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    baseline = loadBaselines().get('hotPaths', {})
+    results = dict(baseline)
+    failed = False
+
+    print('{:<32s} {:>14s} {:>14s} {:>8s}  {}'.format('Benchmark', 'ops/sec', 'Baseline', 'Unit', ''))
+
+    for name, setup in BENCHMARKS:
+        if args.filter.lower() not in name.lower():
+            continue
+
+        try:
+            run, ops, unit = setup()
+        except Skip as e:
+            print('{:<32s} {:>14s} {:>14s} {:>8s}  skipped: {}'.format(name, '-', '-', '', e))
+            continue
+
+        rate = ops / measure(run, args.min_time, args.repeat)
+        results[name] = rate
+        base = baseline.get(name)
+
+        flag = ''
+        if base is not None and rate < base / (1 + args.tolerance):
+            flag = 'REGRESSION ({:.0%} slower)'.format(1 - rate / base)
+            failed = True
+
+        print('{:<32s} {:>14,.0f} {:>14s} {:>8s}  {}'.format(name, rate,
+                                                           '-' if base is None else '{:,.0f}'.format(base),
+                                                           unit, flag))
+
+    if args.save:
+        saveBaselines('hotPaths', results)
+
+    return 1 if failed and not args.save else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
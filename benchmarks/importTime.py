@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Cold start import time of the simulation modules.
+
+Every module is imported in a fresh interpreter, several times, and the median
+import time is compared with the baseline kept in baselines.json. The core
+engine must import with NumPy alone, so the benchmark also fails if importing
+a core module loads pandas, matplotlib or numba.
+
+    python benchmarks/importTime.py             # compare with the baseline
+    python benchmarks/importTime.py --save      # store the current times as the baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Modules that must import with NumPy alone
+CORE = ['TournamentSimulator', 'PlayoffSimulator', 'batchSim', 'seriesTable', 'exactSim', 'parallelSim',
+        'scenarioSim', 'jitSim', 'simResult', 'seasonData', 'seasonBundle', 'seasonArchive', 'seasons',
+        'teamRegistry', 'eloSeason', 'seasonStats', 'multiSeason', 'instrumentation', 'cli', 'PlayoffSim22',
+        'PlayoffSim21', 'PlayoffSim19', 'PlayoffSim']
+
+# Dependencies only loaded when a table, a plot or the compiled kernel is requested
+HEAVY = ['pandas', 'matplotlib', 'numba']
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(','.join(m for m in {heavy!r} if m in sys.modules))
+'''
+
+
+def importTime(module, repeat = 5):
+    '''Function that imports module in repeat fresh interpreters and returns the median
+    import time (seconds) and the heavy dependencies the import loaded'''
+
+    times = []
+    for i in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module = module, heavy = HEAVY)],
+                             cwd = ROOT, capture_output = True, text = True, check = True).stdout.split('\n')
+        times.append(float(out[0]))
+        loaded = [m for m in out[1].split(',') if m]
+
+    return statistics.median(times), loaded
+
+
+def loadBaselines():
+    '''Function that returns the stored baselines, an empty dictionary if there are none'''
+
+    if not os.path.exists(BASELINES):
+        return {}
+
+    with open(BASELINES) as f:
+        return json.load(f)
+
+
+def saveBaselines(section, values):
+    '''Function that stores values as the baselines of one section of baselines.json'''
+
+    baselines = loadBaselines()
+    baselines[section] = values
+
+    with open(BASELINES, 'w') as f:
+        json.dump(baselines, f, indent = 1, sort_keys = True)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Cold start import time of the simulation modules')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'fresh interpreters per module')
+    parser.add_argument('--tolerance', type = float, default = 0.5,
+                        help = 'allowed slowdown over the baseline (0.5 = 50%%)')
+    parser.add_argument('--save', action = 'store_true', help = 'store the times as the new baseline')
+    args = parser.parse_args(argv)
+
+    baseline = loadBaselines().get('imports', {})
+    failed = False
+    times = {}
+
+    print('{:<22s} {:>10s} {:>10s}  {}'.format('Module', 'ms', 'Baseline', 'Heavy imports'))
+
+    for module in CORE:
+        seconds, loaded = importTime(module, args.repeat)
+        times[module] = seconds
+        base = baseline.get(module)
+
+        flags = []
+        if loaded:
+            flags.append('loads ' + ', '.join(loaded))
+        if base is not None and seconds > base * (1 + args.tolerance):
+            flags.append('REGRESSION')
+        failed = failed or bool(flags)
+
+        print('{:<22s} {:>10.1f} {:>10s}  {}'.format(module, seconds * 1000,
+                                                    '-' if base is None else '{:.1f}'.format(base * 1000),
+                                                    ' '.join(flags)))
+
+    if args.save:
+        saveBaselines('imports', times)
+
+    return 1 if failed and not args.save else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Command line entry point.
+
+    python cli.py playoffs 2022 2021 --trials 1000000 --workers 4 --seed 1 --output odds.json
+    python cli.py playoffs all --plot charts --format svg
+    python cli.py season stats-2022.txt --trials 1000 --playoff-trials 1000000
+    python cli.py playoffs 2022 --instrument --profile run.prof --flamegraph run.folded
+
+playoffs simulates the postseason brackets of the given seasons (see seasons.py)
+with the batch engine, one season per worker process (see multiSeason.py),
+prints the World Series odds of every team and writes them to --output (.json
+or .csv). --plot writes one chart per season to a directory with the headless
+renderer. season runs the full Elo regular season and playoff simulation of
+fullSim.py, the regular season on the vectorized engine (eloSeason.py).
+
+Both commands take --instrument, which prints the time spent in every phase and
+the work done (see instrumentation.py), --profile to write cProfile statistics
+and --flamegraph to write sampled call stacks in collapsed format.
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import nullcontext
+import seasons
+
+
+def parseSeasons(values):
+    '''Function that turns the season arguments into a sorted list of seasons, 'all' being
+    every season of seasons.SEASONS'''
+
+    if 'all' in values:
+        return sorted(seasons.SEASONS)
+
+    return sorted(set(int(v) for v in values))
+
+
+def printResult(result):
+    '''Function that prints the World Series odds of every team of a SimulationResult'''
+
+    p, width = result.winProbabilities()
+
+    print('{} MLB Playoff Scenario Simulation: {} Trials'.format(result.season, result.trials))
+    print()
+
+    for name, wins in result.winners():
+        i = result.names.index(name)
+        print('Team: {:^26s}     World Series Win %: {:.2f} +/- {:.2f}'.format(name, p[i] * 100, width[i] * 100))
+
+    print()
+
+
+def writeResults(results, path):
+    '''Function that writes a list of SimulationResults to path as JSON (one entry per season)
+    or as a csv table with one row per season and team'''
+
+    if path.endswith('.csv'):
+        import multiSeason
+
+        multiSeason.combinedTable(results).to_csv(path, index = False)
+
+    elif path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump([result.toDict() for result in results], f, indent = 1)
+
+    else:
+        raise ValueError('Output file must end with .json or .csv: {}'.format(path))
+
+
+def runPlayoffs(args):
+    '''Function that runs the playoffs command'''
+
+    import multiSeason
+
+    cache = None
+    if args.cache is not None:
+        from resultCache import ResultCache
+
+        cache = ResultCache(args.cache, int(args.cache_size * 2**20))
+
+    results = multiSeason.runSeasons(parseSeasons(args.seasons), args.trials, args.workers, args.seed,
+                                     directory = args.data, precision = args.precision, cache = cache)
+
+    for result in results:
+        printResult(result)
+
+    if args.output is not None:
+        writeResults(results, args.output)
+
+    if args.plot is not None:
+        import renderSim
+
+        os.makedirs(args.plot, exist_ok = True)
+        renderSim.renderSeasons(results, args.plot, args.format, args.workers)
+
+    return results
+
+
+def runSeason(args):
+    '''Function that runs the season command'''
+
+    import fullSim
+
+    winners = fullSim.runFullSeason(args.stats, fullSim.teamELO2022, args.trials, args.playoff_trials,
+                                    vectorized = True, seed = args.seed)
+
+    if args.output is not None:
+        winners.to_csv(args.output, index_label = 'Team', header = ['World Series Wins'])
+
+    return winners
+
+
+def runInstrumented(args):
+    '''Function that runs the command with the instrumentation and profilers requested on
+    the command line'''
+
+    import instrumentation
+
+    recorder = instrumentation.Recorder(args.trace_memory) if args.instrument or args.trace_memory else None
+
+    with recorder or nullcontext(), instrumentation.profile(args.profile, args.flamegraph):
+        result = args.run(args)
+
+    if recorder is not None:
+        print(recorder.summary(), file = sys.stderr)
+
+    return result
+
+
+def buildParser():
+    '''Function that returns the argument parser of the command line'''
+
+    parser = argparse.ArgumentParser(prog = 'cli.py', description = 'Monte Carlo simulations of the MLB playoffs')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    # Instrumentation options of every command
+    instrumented = argparse.ArgumentParser(add_help = False)
+    instrumented.add_argument('--instrument', action = 'store_true',
+                              help = 'print the wall time of every phase, the games, series and random numbers '
+                                     'drawn, trials/sec and peak memory to stderr')
+    instrumented.add_argument('--trace-memory', action = 'store_true',
+                              help = 'also trace peak Python and NumPy allocations (slower, implies --instrument)')
+    instrumented.add_argument('--profile', default = None, help = 'file to write cProfile statistics to')
+    instrumented.add_argument('--flamegraph', default = None,
+                              help = 'file to write sampled call stacks to, in collapsed (flame graph) format')
+
+    playoffs = commands.add_parser('playoffs', parents = [instrumented],
+                                   help = 'simulate the postseason of one or more seasons')
+    playoffs.add_argument('seasons', nargs = '+', help = "seasons to simulate, or 'all'")
+    playoffs.add_argument('--trials', type = int, default = 1000000, help = 'brackets simulated per season')
+    playoffs.add_argument('--workers', type = int, default = 1,
+                          help = 'worker processes, one season each (a single season is split over them)')
+    playoffs.add_argument('--seed', type = int, default = None, help = 'root seed, for reproducible runs')
+    playoffs.add_argument('--precision', type = float, default = None,
+                          help = 'stop once every confidence interval half width is at most this many '
+                                 'percentage points (trials is then the maximum)')
+    playoffs.add_argument('--data', default = '.',
+                          help = 'directory or archive (.zip, .tar.gz, ...) of the TeamPitchers/TeamWins files')
+    playoffs.add_argument('--output', default = None, help = 'results file, .json or .csv')
+    playoffs.add_argument('--plot', default = None, help = 'directory to write one chart per season to')
+    playoffs.add_argument('--format', default = 'png', choices = ['png', 'svg'], help = 'chart format')
+    playoffs.add_argument('--cache', default = None,
+                          help = 'directory of the result cache, reruns with the same inputs and seed are '
+                                 'read from it and larger trial counts only simulate the extra trials '
+                                 '(requires --seed)')
+    playoffs.add_argument('--cache-size', type = float, default = 256, help = 'cache size limit in MB')
+    playoffs.set_defaults(run = runPlayoffs)
+
+    season = commands.add_parser('season', parents = [instrumented],
+                                 help = 'simulate the regular season and playoffs from game logs')
+    season.add_argument('stats', nargs = '?', default = 'stats-2022.txt', help = 'Retrosheet game log file')
+    season.add_argument('--trials', type = int, default = 1000, help = 'regular seasons simulated')
+    season.add_argument('--playoff-trials', type = int, default = 1000000, help = 'brackets simulated')
+    season.add_argument('--seed', type = int, default = None, help = 'root seed, for reproducible runs')
+    season.add_argument('--output', default = None, help = 'csv file for the World Series odds')
+    season.set_defaults(run = runSeason)
+
+    return parser
+
+
+def main(argv = None):
+    '''Function that parses the command line arguments and runs the command'''
+
+    args = buildParser().parse_args(argv)
+
+    if args.command == 'playoffs' and args.output is not None and not args.output.endswith(('.json', '.csv')):
+        buildParser().error('--output must end with .json or .csv')
+    if args.command == 'playoffs' and args.cache is not None and args.precision is not None:
+        buildParser().error('--cache runs a fixed number of trials, it cannot be used with --precision')
+    if args.command == 'playoffs' and args.cache is not None and args.seed is None:
+        buildParser().error('--cache needs --seed, an unseeded run has nothing to be found under')
+
+    runInstrumented(args)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
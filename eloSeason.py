@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized Elo regular season engine.
+
+The games of a season have to be played in order (every result moves the
+ratings used by the next games), but the simulated seasons are independent.
+So instead of walking the game log once per season, every game is played once
+for a whole chunk of seasons: the ratings and wins are (teams, seasons) arrays,
+a game reads two rows, draws one uniform per season and updates the two rows.
+
+Teams are referred to by their teamRegistry ID, the schedule is a pair of home
+and away ID arrays in game order (see readSchedule for Retrosheet game logs).
+The win probability and rating update are the ones of the 538 MLB ratings the
+preseason values come from: the home team wins with probability
+1 / (1 + 10^((away - home - HOME_ADVANTAGE) / 400)) and the winner takes
+K * (1 - p) points from the loser, p being its win probability.
+"""
+
+import csv
+import numpy as np
+import instrumentation
+import teamRegistry
+from seasonStats import SeasonStats
+
+
+# Points moved by a game, times (result - win probability)
+K = 4
+
+# Elo points added to the home team rating in the win probability
+HOME_ADVANTAGE = 24
+
+# Number of seasons simulated per chunk, keeps the ratings and uniforms at a few MB
+SEASON_CHUNK = 50000
+
+# Number of games whose uniforms are drawn at once
+GAME_BLOCK = 32
+
+# Team fields of a Retrosheet game log line (https://www.retrosheet.org/gamelogs/glfields.txt)
+VISITOR_FIELD = 3
+HOME_FIELD = 6
+
+
+def scheduleArrays(games):
+    '''Function that takes a list of (home, away) team aliases in game order and returns
+    the int64 arrays of the home and away team IDs'''
+
+    home = teamRegistry.teamIds([h for h, a in games])
+    away = teamRegistry.teamIds([a for h, a in games])
+
+    return home, away
+
+
+def readSchedule(file):
+    '''Function that reads a Retrosheet game log (https://www.retrosheet.org/gamelogs/index.html)
+    and returns the int64 arrays of the home and away team IDs of every game, in file order'''
+
+    with open(file, newline = '') as f:
+        games = [(row[HOME_FIELD], row[VISITOR_FIELD]) for row in csv.reader(f) if row]
+
+    return scheduleArrays(games)
+
+
+def ratingArray(teamELO, schedule):
+    '''Function that takes a dictionary of team ratings ({alias: elo}) and returns the
+    float64 array of the rating of every team ID, NaN for teams not in the dictionary.
+    Every team of the schedule must have a rating'''
+
+    ratings = np.full(len(teamRegistry.TEAMS), np.nan)
+    for alias, elo in teamELO.items():
+        ratings[teamRegistry.teamId(alias)] = elo
+
+    missing = [teamRegistry.CODES[i] for i in np.unique(np.concatenate(schedule)) if np.isnan(ratings[i])]
+    if missing:
+        raise ValueError('No rating for {}'.format(', '.join(missing)))
+
+    return ratings
+
+
+def playGames(home, away, elo, wins, uniforms, k, homeAdvantage):
+    '''Function that plays a block of games for every season of a chunk, in order.
+    elo (float64) and wins (int16) are (teams, seasons) arrays updated in place, uniforms
+    a (games, seasons) array'''
+
+    n = elo.shape[1]
+    p = np.empty(n)
+    won = np.empty(n, dtype = np.bool_)
+    delta = np.empty(n)
+
+    for g in range(len(home)):
+        h = home[g]
+        a = away[g]
+
+        # Home win probability: 1 / (1 + 10^((away - home - advantage) / 400))
+        np.subtract(elo[a], elo[h], out = p)
+        p -= homeAdvantage
+        p *= np.log(10) / 400
+        np.exp(p, out = p)
+        p += 1
+        np.reciprocal(p, out = p)
+
+        np.less(uniforms[g], p, out = won)
+
+        # Home team gains k * (result - p), the away team loses as much
+        np.subtract(won, p, out = delta)
+        delta *= k
+        elo[h] += delta
+        elo[a] -= delta
+
+        wins[h] += won
+        wins[a] += ~won
+
+
+def seasonChunks(schedule, teamELO, trials, seed = None, teamWins = None, k = K,
+                 homeAdvantage = HOME_ADVANTAGE):
+    '''Function that simulates the regular season trials times and yields, chunk by chunk,
+    the int16 wins and float64 final ratings of every season, both (teams, seasons) arrays
+    indexed by team ID (teams without a rating stay at NaN and 0 wins).
+    schedule is the pair of home and away team ID arrays, teamELO the dictionary of
+    preseason ratings, teamWins an optional dictionary of wins to start from'''
+
+    home, away = schedule
+    ratings = ratingArray(teamELO, schedule)
+
+    start = np.zeros(len(ratings), dtype = np.int16)
+    for alias, w in (teamWins or {}).items():
+        start[teamRegistry.teamId(alias)] = w
+
+    rng = np.random.default_rng(seed)
+
+    for first in range(0, trials, SEASON_CHUNK):
+        n = min(SEASON_CHUNK, trials - first)
+
+        elo = np.repeat(ratings[:, None], n, axis = 1)
+        wins = np.repeat(start[:, None], n, axis = 1)
+
+        for g in range(0, len(home), GAME_BLOCK):
+            uniforms = rng.random((min(GAME_BLOCK, len(home) - g), n))
+            playGames(home[g:g + GAME_BLOCK], away[g:g + GAME_BLOCK], elo, wins, uniforms, k, homeAdvantage)
+
+        instrumentation.count('seasons', n)
+        yield wins, elo
+
+
+def simulateSeasons(schedule, teamELO, trials, seed = None, teamWins = None, k = K,
+                    homeAdvantage = HOME_ADVANTAGE):
+    '''Function that simulates the regular season trials times and returns the int16 wins
+    and float64 final ratings of every season, both (trials, teams) arrays indexed by team
+    ID. Takes the same arguments as seasonChunks'''
+
+    chunks = list(seasonChunks(schedule, teamELO, trials, seed, teamWins, k, homeAdvantage))
+    if not chunks:
+        teams = len(teamRegistry.TEAMS)
+        return np.empty((0, teams), dtype = np.int16), np.empty((0, teams))
+
+    wins = np.concatenate([w for w, e in chunks], axis = 1).T
+    elo = np.concatenate([e for w, e in chunks], axis = 1).T
+
+    return wins, elo
+
+
+def seasonStats(schedule, teamELO, trials, seed = None, teamWins = None, k = K,
+                homeAdvantage = HOME_ADVANTAGE):
+    '''Function that simulates the regular season trials times and returns the SeasonStats
+    (mean, variance, percentiles and win distribution) of every team of teamELO, streamed
+    chunk by chunk so memory does not grow with trials. Takes the same arguments as
+    seasonChunks'''
+
+    ids = teamRegistry.teamIds(list(teamELO))
+    games = np.bincount(np.concatenate(schedule), minlength = len(teamRegistry.TEAMS))[ids]
+    start = np.array([(teamWins or {}).get(team, 0) for team in teamELO], dtype = np.int64)
+
+    stats = SeasonStats(list(teamELO), [teamELO[team] for team in teamELO], int((games + start).max()))
+
+    for wins, elo in seasonChunks(schedule, teamELO, trials, seed, teamWins, k, homeAdvantage):
+        with instrumentation.phase('aggregation'):
+            stats.update(wins[ids], elo[ids])
+
+    return stats
+
+
+def runManySeasons(nTrials, schedule, teamELO, teamWins, seed = None, k = K,
+                   homeAdvantage = HOME_ADVANTAGE):
+    '''Function that simulates the regular season nTrials times and returns two
+    dictionaries keyed like teamELO: the average final rating and the average wins of
+    every team (see seasonStats for their spread and percentiles)'''
+
+    stats = seasonStats(schedule, teamELO, nTrials, seed, teamWins, k, homeAdvantage)
+
+    eloAvg = dict(zip(stats.teams, stats.eloMean))
+    winsAvg = dict(zip(stats.teams, stats.winsMean))
+
+    return eloAvg, winsAvg
+
+
+def dataframe(winsAvg, eloAvg):
+    '''Function that returns a pandas dataframe of the average wins and rating of every
+    team, indexed by team and sorted by wins (the input of the fullSim playoff picks)'''
+
+    import pandas as pd
+
+    df = pd.DataFrame({'Predicted Wins': winsAvg, 'Predicted Elo': eloAvg})
+
+    return df.sort_values(by = 'Predicted Wins', ascending = False)
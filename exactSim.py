@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Exact (non Monte Carlo) championship probabilities.
+
+Every series is a fixed best of 1, 3, 5 or 7 with a known home pattern and
+pitcher rotation, so the odds of every team winning the title can be computed
+by dynamic programming over series outcomes instead of simulating brackets.
+The execution plan of the playoff format is walked once, keeping the probability
+of every reachable combination of series winners.
+Uses the same win ratio formula as Baseball.simulateMatchup.
+"""
+
+from batchSim import bracketArrays, gameProbabilities
+from seriesTable import SeriesTable
+from TournamentSimulator import SERIES
+from PlayoffSimulator import bracketFor
+
+
+def leagueChampionOdds(table, bracket, offset):
+    '''Function that runs the execution plan of the bracket for one league and returns
+    the distribution ({team index: probability}) of the pennant winner.
+    A state is the tuple of the teams in every slot filled so far'''
+
+    states = {tuple(offset + s for s in range(bracket.seeds)): 1.0}
+
+    for op, fmt, a, b, out, r in bracket.steps:
+        nextStates = {}
+
+        for state, p in states.items():
+            if op == SERIES:
+                # Lower team index is the higher seed
+                hi, lo = min(state[a], state[b]), max(state[a], state[b])
+                q = table.winProbability(hi, lo, bracket.formats[fmt])
+                outcomes = ((state + (hi,), p * q), (state + (lo,), p * (1 - q)))
+            else:
+                # Reseed: sort the b slots starting at a by seed
+                outcomes = ((state + tuple(sorted(state[a:a + b])), p),)
+
+            for nextState, pn in outcomes:
+                nextStates[nextState] = nextStates.get(nextState, 0) + pn
+
+        states = nextStates
+
+    champ = {}
+    for state, p in states.items():
+        champ[state[bracket.champion]] = champ.get(state[bracket.champion], 0) + p
+
+    return champ
+
+
+def championshipOdds(nl, al, table = None, bracket = None):
+    '''Function that takes the nl and al bracket dictionaries and returns a dictionary
+    of every team name and its exact odds of winning the World Series.
+    Series odds are looked up in table (a SeriesTable of the bracket) if given.
+    The playoff format defaults to the one matching the number of seeds'''
+
+    if bracket is None:
+        bracket = bracketFor(nl)
+
+    names, strength, wins = bracketArrays(nl, al)
+
+    if table is None:
+        table = SeriesTable(gameProbabilities(strength), bracket.formats)
+
+    nlChamp = leagueChampionOdds(table, bracket, 0)
+    alChamp = leagueChampionOdds(table, bracket, len(nl))
+
+    champ = {}
+
+    for n, pn in nlChamp.items():
+        for a, pa in alChamp.items():
+
+            # Team with more regular season wins is home team, AL on ties
+            if wins[n] > wins[a]:
+                home, away = n, a
+            else:
+                home, away = a, n
+
+            p = table.winProbability(home, away, bracket.final)
+            champ[home] = champ.get(home, 0) + pn * pa * p
+            champ[away] = champ.get(away, 0) + pn * pa * (1 - p)
+
+    return {names[i]: float(champ.get(i, 0.0)) for i in range(len(names))}
@@ -5,29 +5,52 @@ Created on Mon Feb 27 03:58:53 2023
 @author: Stephen Kim
 """
 
-import eloSimulation
-import PlayoffSim
-import parseText
+import importlib
+import eloSeason
+import instrumentation
+from teamRegistry import divisionCodes, AL, NL, EAST, CENTRAL, WEST
 import pandas as pd
 
+def legacyModule(name):
+    '''Function that imports a module of the game by game regular season (eloSimulation,
+    parseText), which is not part of this repository, and raises a ModuleNotFoundError
+    naming it and the vectorized engine if it is not installed'''
+
+    try:
+        return importlib.import_module(name)
+    except ModuleNotFoundError as error:
+        raise ModuleNotFoundError('{} (game by game regular season) is not installed, use the vectorized '
+                                  'engine (vectorized = True)'.format(name), name = name) from error
+
+
 class MLBFullSeason():
     
-    def __init__(self, statsDict, teamELO, teamWins):
+    def __init__(self, statsDict, teamELO, teamWins, schedule = None):
         '''MLBFullSeason class takes three parameters.
         Dictionary of game logs from Retrosheet.com
         Dictionary of team ELO values generated from preseason from 538.com
-        Dictionary of team wins with each team starting at 0'''
+        Dictionary of team wins with each team starting at 0
+        If the home and away team ID arrays of the schedule are given (see
+        eloSeason.readSchedule), the regular season runs on the vectorized engine'''
         
         self.statsDict = statsDict                  # Dict of game stats
         self.teamELO = teamELO                      # Dict of elo values from preseason 
         self.teamWins = teamWins                    # Dict of team wins reset to 0
+        self.schedule = schedule                    # Home and away team IDs of every game
         
         return
     
-    def SimulateRegularSeason(self, nTrials = 1000):
+    def SimulateRegularSeason(self, nTrials = 1000, seed = None):
         '''Function that takes number of trials as parameter with default set at 10_000.
         Return for each team the end of season predicted wins and predicted ELO'''
         
+        # Vectorized engine: means plus the spread and 10/50/90 percentiles of every team
+        if self.schedule is not None:
+            stats = eloSeason.seasonStats(self.schedule, self.teamELO, nTrials, seed, self.teamWins)
+            return stats.frame()
+        
+        eloSimulation = legacyModule('eloSimulation')
+        
         sim = eloSimulation.eloSim(self.teamELO)
         eloAvg, winsAvg = sim.runManySeasons(nTrials, self.statsDict, self.teamELO, self.teamWins)
         df = sim.dataframe(winsAvg, eloAvg)
@@ -52,25 +75,38 @@ class MLBFullSeason():
         return playoffAL, playoffNL
     
     
-    def SimulatePlayoffs(self, nl, al, nTrials = 100000):
+    def SimulatePlayoffs(self, nl, al, nTrials = 100000, seed = None):
         '''Function that takes a dict of nl playoff teams and a dict of al playoff
-        teams (that both contain the seeding, name, and ELO rating of each team) and 
-        number of nTrials as parameters, then runs the playoff
-        simulation nTrials times and returns the odds of each playoff team winning
-        the World Series'''
+        teams (that both contain the seeding, name, ELO rating and predicted wins of each
+        team) and number of nTrials as parameters, then runs the playoff
+        simulation nTrials times with the batch engine and returns the World Series win
+        count of each playoff team'''
+        
+        from PlayoffSim22 import Baseball
         
-        sim = PlayoffSim.Baseball(nl, al)
-        winners = sim.runSimulation(nTrials)   
+        # Every pitcher slot of a team is rated with its Elo, predicted wins pick the
+        # World Series home team
+        nlBracket = {s: [t[0], t[1], t[1], t[1], t[2]] for s, t in nl.items()}
+        alBracket = {s: [t[0], t[1], t[1], t[1], t[2]] for s, t in al.items()}
+        
+        sim = Baseball(nlBracket, alBracket)
+        winners = sim.runSimulation(nTrials, batch = True, seed = seed, plot = False)
         
         return winners
     
     
+    def seedEntry(self, df, i):
+        '''Return the [name, ELO rating, predicted wins] list of row i of a dataframe'''
+        
+        return [str(df.index[i]), df.iloc[i]['Predicted Elo'], df.iloc[i]['Predicted Wins']]
+    
+    
     
     
     
     def ALPlayoffTeams(self, ALEast, ALCentral, ALWest):
         '''Function that takes AL division dataframes and returns dictionary
-        for AL playoff teams with seeding, name, and ELO rating'''
+        for AL playoff teams with seeding, name, ELO rating and predicted wins'''
         
         al = {}
         
@@ -89,26 +125,26 @@ class MLBFullSeason():
         #print(wildCard)
         
         # No. 1 seed is team with best league record
-        al[1] = [str(divWinners.index[0]), divWinners.iloc[0]['Predicted Elo']]
+        al[1] = self.seedEntry(divWinners, 0)
         
         # No. 2 seed is second best division winner
-        al[2] = [str(divWinners.index[1]), divWinners.iloc[1]['Predicted Elo']]
+        al[2] = self.seedEntry(divWinners, 1)
         
         # No. 3 seed is third best division winner
-        al[3] = [str(divWinners.index[2]), divWinners.iloc[2]['Predicted Elo']]
+        al[3] = self.seedEntry(divWinners, 2)
         
         # No. 4 - 6 seeds are top three wild card teams
-        al[4] = [str(wildCard.index[0]), wildCard.iloc[0]['Predicted Elo']]
+        al[4] = self.seedEntry(wildCard, 0)
         
-        al[5] = [str(wildCard.index[1]), wildCard.iloc[1]['Predicted Elo']]
+        al[5] = self.seedEntry(wildCard, 1)
         
-        al[6] = [str(wildCard.index[2]), wildCard.iloc[2]['Predicted Elo']]
+        al[6] = self.seedEntry(wildCard, 2)
         
         return al
     
     def NLPlayoffTeams(self, NLEast, NLCentral, NLWest):
         '''Function that takes NL division dataframes and returns dictionary
-        for AL playoff teams with seeding, name, and ELO rating'''
+        for NL playoff teams with seeding, name, ELO rating and predicted wins'''
         
         nl = {}
         
@@ -127,20 +163,20 @@ class MLBFullSeason():
         #print(wildCard)
         
         # No. 1 seed is team with best league record
-        nl[1] = [str(divWinners.index[0]), divWinners.iloc[0]['Predicted Elo']]
+        nl[1] = self.seedEntry(divWinners, 0)
         
         # No. 2 seed is second best division winner
-        nl[2] = [str(divWinners.index[1]), divWinners.iloc[1]['Predicted Elo']]
+        nl[2] = self.seedEntry(divWinners, 1)
         
         # No. 3 seed is third best division winner
-        nl[3] = [str(divWinners.index[2]), divWinners.iloc[2]['Predicted Elo']]
+        nl[3] = self.seedEntry(divWinners, 2)
         
         # No. 4 - 6 seeds are top three wild card teams
-        nl[4] = [str(wildCard.index[0]), wildCard.iloc[0]['Predicted Elo']]
+        nl[4] = self.seedEntry(wildCard, 0)
         
-        nl[5] = [str(wildCard.index[1]), wildCard.iloc[1]['Predicted Elo']]
+        nl[5] = self.seedEntry(wildCard, 1)
         
-        nl[6] = [str(wildCard.index[2]), wildCard.iloc[2]['Predicted Elo']]
+        nl[6] = self.seedEntry(wildCard, 2)
         
         return nl
         
@@ -148,7 +184,7 @@ class MLBFullSeason():
     def getALEast(self, df):
         '''Return pandas dataframe of ALEast predicted wins and elo rating'''
         
-        alEast = df[df.index.str.startswith(('BAL', 'BOS', 'NYA', 'TBA', 'TOR'))]
+        alEast = df[df.index.str.startswith(divisionCodes(AL, EAST))]
         
         #print(alEast)
         
@@ -158,7 +194,7 @@ class MLBFullSeason():
     def getALCentral(self, df):
         '''Return pandas dataframe of ALCentral predicted wins and elo rating'''
         
-        alCentral = df[df.index.str.startswith(('CHA', 'CLE', 'DET', 'KCA', 'MIN'))]
+        alCentral = df[df.index.str.startswith(divisionCodes(AL, CENTRAL))]
         
         #print(alCentral)
         
@@ -168,7 +204,7 @@ class MLBFullSeason():
     def getALWest(self, df):
         '''Return pandas dataframe of ALWest predicted wins and elo rating'''
         
-        alWest = df[df.index.str.startswith(('HOU', 'ANA', 'OAK', 'SEA', 'TEX'))]
+        alWest = df[df.index.str.startswith(divisionCodes(AL, WEST))]
         
         #print(alWest)
         
@@ -178,7 +214,7 @@ class MLBFullSeason():
     def getNLEast(self, df):
         '''Return pandas dataframe of NLEast predicted wins and elo rating'''
         
-        nlEast = df[df.index.str.startswith(('ATL', 'MIA', 'NYN', 'PHI', 'WAS'))]
+        nlEast = df[df.index.str.startswith(divisionCodes(NL, EAST))]
         
         #print(nlEast)
         
@@ -188,7 +224,7 @@ class MLBFullSeason():
     def getNLCentral(self, df):
         '''Return pandas dataframe of NLCentral predicted wins and elo rating'''
         
-        nlCentral = df[df.index.str.startswith(('CHN', 'CIN', 'MIL', 'PIT', 'SLN'))]
+        nlCentral = df[df.index.str.startswith(divisionCodes(NL, CENTRAL))]
         
         #print(nlCentral)
         
@@ -198,23 +234,12 @@ class MLBFullSeason():
     def getNLWest(self, df):
         '''Return pandas dataframe of NLWest predicted wins and elo rating'''
         
-        nlWest = df[df.index.str.startswith(('LAN', 'SDN', 'SFN', 'COL', 'ARI'))]
+        nlWest = df[df.index.str.startswith(divisionCodes(NL, WEST))]
         
         #print(nlWest)
         
         return nlWest
-    
-    
-    
-    
-    
-    
-    
-    
-    
-# Game logs found at https://www.retrosheet.org/gamelogs/index.html    
-statFile = 'stats-2022.txt'
-gameStats = parseText.parseTextFile(statFile) # Returns a dictionary    
+
 
 # Starting elo values from 2022 preseason 
 teamELO2022 = {
@@ -250,25 +275,40 @@ teamELO2022 = {
     'BAL': 1430,
 }
 
-# Starting team wins all at 0
-teamWins = {key: 0 for key in teamELO2022}    
-    
-# Create MLB Simulator object
-mlb = MLBFullSeason(gameStats, teamELO2022, teamWins)
 
+def runFullSeason(statFile = 'stats-2022.txt', teamELO = teamELO2022, nTrials = 1000,
+                  playoffTrials = 1000000, vectorized = True, seed = None):
+    '''Function that simulates the regular season nTrials times from the Retrosheet game
+    logs in statFile (https://www.retrosheet.org/gamelogs/index.html) and the preseason
+    elo values, picks the playoff teams and simulates the playoffs playoffTrials times.
+    The regular season runs on the vectorized engine (eloSeason), or game by game with the
+    eloSimulation and parseText modules if vectorized is False (not part of this repository).
+    seed seeds the vectorized regular season and the playoffs.
+    Returns the World Series win count of each playoff team'''
+
+    with instrumentation.phase('load'):
+        if vectorized:
+            gameStats = None
+            schedule = eloSeason.readSchedule(statFile)
+        else:
+            parseText = legacyModule('parseText')
+            gameStats = parseText.parseTextFile(statFile)   # Returns a dictionary
+            schedule = None
+
+    # Starting team wins all at 0
+    teamWins = {key: 0 for key in teamELO}
+
+    # Create MLB Simulator object
+    mlb = MLBFullSeason(gameStats, teamELO, teamWins, schedule)
 
-# Simulate regular season (optional paramater is number of trials - default is 10_000)
-df = mlb.SimulateRegularSeason()
-type(df)
-#print(df)
-#print(df.index)
+    # Simulate regular season
+    with instrumentation.phase('regular season'):
+        df = mlb.SimulateRegularSeason(nTrials, seed)
 
-# Extract playoff teams
-nl, al = mlb.PlayoffTeamPredictor2022(df)
-#print(nl)
-#print(al)
+    # Extract playoff teams
+    with instrumentation.phase('seeding'):
+        al, nl = mlb.PlayoffTeamPredictor2022(df)
 
-# Simulate playoffs
-winners = mlb.SimulatePlayoffs(nl, al, 1000000)
-#print(winners)
-# Show odds of winning world series
\ No newline at end of file
+    # Simulate playoffs
+    with instrumentation.phase('playoffs'):
+        return mlb.SimulatePlayoffs(nl, al, playoffTrials, seed)
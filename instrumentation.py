@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of simulation runs.
+
+Nothing is measured unless a Recorder is active:
+
+    with instrumentation.Recorder() as rec:
+        Baseball(nl, al).runSimulation(1000000, batch = True, plot = False)
+    print(rec.summary())
+
+While a recorder is active, the simulators report the wall time of every phase
+(load, regular season, seeding, setup, every playoff round, aggregation,
+plotting), the random numbers drawn, the games and series simulated and the
+trials run. The recorder adds the trials per second and the peak memory. Phases
+nest: the rounds of a run are recorded under its 'simulate' phase. Only the
+calling process is measured, the shards of a parallel run show up as their
+round trip in the 'simulate' phase.
+
+profile() runs cProfile over a block and can also sample the call stack of the
+main thread, writing collapsed stacks ('main;run;simulate 12' lines) that
+flamegraph.pl, speedscope or inferno turn into a flame graph.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# Recorder of the current run, None when instrumentation is off
+active = None
+
+# Seconds between two stack samples of profile()
+SAMPLE_INTERVAL = 0.005
+
+
+def phase(name):
+    '''Function that returns a context manager timing the block as phase name of the
+    active recorder, which does nothing when no recorder is active'''
+
+    if active is None:
+        return nullcontext()
+
+    return active.phase(name)
+
+
+def count(name, n = 1):
+    '''Function that adds n to the counter name of the active recorder, if any'''
+
+    if active is not None:
+        active.count(name, n)
+
+
+def peakRSS():
+    '''Function that returns the peak resident memory of the process in bytes, None where
+    the resource module is not available (Windows)'''
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Recorder():
+    '''Collects phase wall times and counters while it is active (used as a context
+    manager). If traceMemory is True, the peak memory allocated by Python and NumPy
+    during the run is traced with tracemalloc, which slows the loop engine down'''
+
+    def __init__(self, traceMemory = False):
+        self.traceMemory = traceMemory
+        self.phases = {}                # {phase path: [seconds, calls]}
+        self.counters = {}
+        self.stack = []
+        self.wall = 0.0
+        self.peakTraced = None
+        self.previous = None
+
+
+    def __enter__(self):
+        global active
+
+        self.previous, active = active, self
+        if self.traceMemory:
+            import tracemalloc
+            tracemalloc.start()
+        self.start = time.perf_counter()
+
+        return self
+
+
+    def __exit__(self, *exc):
+        global active
+
+        self.wall += time.perf_counter() - self.start
+        if self.traceMemory:
+            import tracemalloc
+            self.peakTraced = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        active = self.previous
+
+        return False
+
+
+    @contextmanager
+    def phase(self, name):
+        '''Function that times the block as phase name, nested under the phases already open'''
+
+        self.stack.append(name)
+
+        # Added before the block runs, so phases are listed before the phases they hold
+        entry = self.phases.setdefault(' > '.join(self.stack), [0.0, 0])
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+            self.stack.pop()
+
+
+    def addTime(self, name, seconds):
+        '''Function that adds seconds to phase name, nested under the phases already open.
+        Used by loops that time their steps themselves'''
+
+        entry = self.phases.setdefault(' > '.join(self.stack + [name]), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+    def count(self, name, n = 1):
+        '''Function that adds n to the counter name'''
+
+        self.counters[name] = self.counters.get(name, 0) + n
+
+
+    def report(self):
+        '''Function that returns a dictionary of the wall time, the phases ({path: {'seconds',
+        'calls'}}), the counters, the trials per second and the peak memory (bytes)'''
+
+        trials = self.counters.get('trials', 0)
+
+        return {'wall': self.wall,
+                'phases': {path: {'seconds': s, 'calls': c} for path, (s, c) in self.phases.items()},
+                'counters': dict(self.counters),
+                'trialsPerSecond': trials / self.wall if trials and self.wall else None,
+                'peakRSS': peakRSS(),
+                'peakTraced': self.peakTraced}
+
+
+    def summary(self):
+        '''Function that returns the report as printable text'''
+
+        report = self.report()
+        lines = ['{:<48s} {:>10s} {:>7s} {:>10s}'.format('Phase', 'Seconds', '%', 'Calls')]
+
+        # Every phase under the phase holding it, in the order phases were first seen
+        first = {path: i for i, path in enumerate(report['phases'])}
+        parts = {path: path.split(' > ') for path in report['phases']}
+        order = sorted(report['phases'], key = lambda path: [first.get(' > '.join(parts[path][:k + 1]), -1)
+                                                             for k in range(len(parts[path]))])
+
+        for path in order:
+            entry = report['phases'][path]
+            depth = path.count(' > ')
+            name = '  ' * depth + path.split(' > ')[-1]
+            lines.append('{:<48s} {:>10.3f} {:>7.1f} {:>10,d}'.format(
+                name, entry['seconds'], entry['seconds'] / report['wall'] * 100 if report['wall'] else 0,
+                entry['calls']))
+
+        lines.append('{:<48s} {:>10.3f}'.format('Total', report['wall']))
+        lines.append('')
+
+        for name, value in sorted(report['counters'].items()):
+            lines.append('{:<48s} {:>18,d}'.format(name, value))
+        if report['trialsPerSecond'] is not None:
+            lines.append('{:<48s} {:>18,.0f}'.format('trials/sec', report['trialsPerSecond']))
+        if report['peakRSS'] is not None:
+            lines.append('{:<48s} {:>15.1f} MB'.format('peak resident memory', report['peakRSS'] / 2**20))
+        if report['peakTraced'] is not None:
+            lines.append('{:<48s} {:>15.1f} MB'.format('peak traced memory', report['peakTraced'] / 2**20))
+
+        return '\n'.join(lines)
+
+
+class StackSampler(threading.Thread):
+    '''Thread that samples the call stack of a thread every interval seconds and counts
+    every distinct stack, for collapsed stack (flame graph) output'''
+
+    def __init__(self, threadId, interval = SAMPLE_INTERVAL):
+        super().__init__(daemon = True)
+        self.threadId = threadId
+        self.interval = interval
+        self.stacks = {}
+        self.done = threading.Event()
+
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.threadId)
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename),
+                                                 code.co_firstlineno))
+                frame = frame.f_back
+
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+
+    def write(self, path):
+        '''Function that writes the sampled stacks in collapsed format, one 'frame;frame count'
+        line per stack'''
+
+        with open(path, 'w') as f:
+            for stack, n in sorted(self.stacks.items()):
+                f.write('{} {}\n'.format(stack, n))
+
+
+@contextmanager
+def profile(statsFile = None, collapsedFile = None, interval = SAMPLE_INTERVAL):
+    '''Function that profiles the block. The cProfile statistics are written to statsFile
+    (read with pstats or snakeviz), stacks sampled every interval seconds are written to
+    collapsedFile in collapsed format. cProfile only runs if statsFile is given, so it does
+    not skew the sampled stacks. Yields the cProfile.Profile (None without statsFile)'''
+
+    sampler = None
+    if collapsedFile is not None:
+        sampler = StackSampler(threading.get_ident(), interval)
+        sampler.start()
+
+    profiler = None
+    if statsFile is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        yield profiler
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(collapsedFile)
+        if profiler is not None:
+            profiler.dump_stats(statsFile)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-season batch runner.
+
+The data files of every season are read once, in the parent process, and each
+season is then simulated as one task of a process pool, so a sweep over all
+seasons takes about as long as its slowest season. Every season gets its own
+seed spawned from one root seed, so results do not depend on the number of
+workers, on the order seasons finish in or on the other seasons of the list
+(only on the position of the season in it). A single season split over several
+workers (see parallelSim) is reproducible for a given number of workers.
+"""
+
+import os
+from multiprocessing import Pool
+import numpy as np
+import seasons
+
+
+def loadSeasons(seasonList, directory = '.'):
+    '''Function that reads the data files of every season once, from a directory or an
+    archive, and returns a dictionary of every season and its (nl, al) dictionaries of seeds'''
+
+    return seasons.loadBrackets(seasonList, directory)
+
+
+def simulateSeason(task):
+    '''Function that takes a (season, nl, al, bracket, trials, seed, precision, cache, files)
+    tuple and returns the SimulationResult of the season'''
+
+    from PlayoffSim22 import Baseball
+
+    season, nl, al, bracket, trials, seed, precision, cache, files = task
+
+    return Baseball(nl, al, bracket).simulate(trials, season, True, 1, seed, precision = precision,
+                                              cache = cache, files = files)
+
+
+def runSeasons(seasonList, trials = 1000000, workers = None, seed = None, brackets = None,
+               directory = '.', precision = None, cache = None):
+    '''Function that simulates the postseason of every season of seasonList and returns
+    the list of SimulationResults in the same order.
+    Brackets are read from the season files (see seasons.SEASONS) unless brackets gives
+    them, as a dictionary of season and (nl, al) or (nl, al, playoff format).
+    Seasons are simulated over a pool of workers processes, one per CPU by default.
+    A single season is split over the workers instead (see parallelSim).
+    If cache (a resultCache.ResultCache) is given, results are read from or added to it,
+    keyed by the season files, and the seed of every season is an integer drawn from the
+    root seed, the same on every run. Unseeded runs are not cached'''
+
+    seasonList = list(seasonList)
+    brackets = dict(brackets or {})
+
+    missing = [season for season in seasonList if season not in brackets]
+    brackets.update(loadSeasons(missing, directory))
+
+    # A cached run needs an integer seed, one per season so seasons are independent samples
+    seeds = np.random.SeedSequence(seed).spawn(len(seasonList))
+    if cache is not None:
+        seeds = [None if seed is None else int(s.generate_state(1, np.uint64)[0]) for s in seeds]
+
+    tasks = []
+    for season, seasonSeed in zip(seasonList, seeds):
+        nl, al, *bracket = brackets[season]
+        files = seasons.dataFiles(season, directory) if season in missing else ()
+        tasks.append((season, nl, al, bracket[0] if bracket else None, trials, seasonSeed, precision, cache,
+                      files))
+
+    if len(tasks) == 1 and precision is None and workers is not None and workers > 1:
+        from PlayoffSim22 import Baseball
+
+        season, nl, al, bracket, trials, seasonSeed, precision, cache, files = tasks[0]
+        return [Baseball(nl, al, bracket).simulate(trials, season, True, workers, seasonSeed, cache = cache,
+                                                   files = files)]
+
+    if workers == 1 or len(tasks) == 1:
+        return [simulateSeason(task) for task in tasks]
+
+    with Pool(min(workers or os.cpu_count(), len(tasks))) as pool:
+        return pool.map(simulateSeason, tasks, chunksize = 1)
+
+
+def combinedTable(results):
+    '''Function that takes a list of SimulationResults and returns one pandas dataframe
+    with a row per season and team (see SimulationResult.table)'''
+
+    import pandas as pd
+
+    tables = []
+    for result in results:
+        table = result.table()
+        table.insert(0, 'Season', result.season)
+        tables.append(table.rename_axis('Team').reset_index())
+
+    return pd.concat(tables, ignore_index = True)
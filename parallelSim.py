@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-process sharded playoff simulation.
+
+Trials are split into one shard per worker. Every shard gets an independent
+seed spawned from one root seed, so the merged champion counts are bitwise
+reproducible for a given root seed and worker count. The bracket dictionaries
+are sent to each worker once, when the worker process starts.
+"""
+
+from multiprocessing import Pool
+import numpy as np
+import batchSim
+import instrumentation
+from seriesTable import SeriesTable
+from PlayoffSimulator import bracketFor
+
+
+# Bracket of the current worker process, set once by initWorker
+workerState = {}
+
+
+def initWorker(nl, al, bracket, gameProbs = None):
+    '''Function that runs once in every worker process and keeps the bracket and its
+    series table for all the shards the worker simulates. gameProbs is the game
+    probability matrix of the bracket, computed if not given'''
+
+    if gameProbs is None:
+        gameProbs = batchSim.gameProbabilities(batchSim.bracketArrays(nl, al)[1])
+
+    workerState['nl'] = nl
+    workerState['al'] = al
+    workerState['bracket'] = bracket
+    workerState['table'] = SeriesTable(gameProbs, bracket.formats)
+
+
+def runShard(shard):
+    '''Function that takes a (trials, SeedSequence, record, antithetic, advancement) tuple,
+    simulates the bracket of the worker and returns the champion count of every team,
+    the per-trial champion record (None unless record is True) and the round
+    advancement counts (None unless advancement is True)'''
+
+    trials, seedSeq, record, antithetic, advancement = shard
+
+    names, counts, champions, reached = batchSim.simulateBracket(workerState['nl'], workerState['al'], trials,
+                                                                 seedSeq, workerState['table'], record,
+                                                                 antithetic, workerState['bracket'],
+                                                                 advancement)
+
+    return counts, champions, reached
+
+
+def splitTrials(trials, shards):
+    '''Function that splits the trials into shards as evenly as possible'''
+
+    base, extra = divmod(trials, shards)
+
+    return [base + 1 if i < extra else base for i in range(shards)]
+
+
+def simulateParallel(nl, al, trials, workers, seed = None, record = False, antithetic = False,
+                     bracket = None, advancement = False, gameProbs = None):
+    '''Function that simulates the bracket trials times over a pool of workers
+    processes and returns the list of team names, the merged champion counts, the
+    per-trial champion record in shard order (None unless record is True) and the
+    merged round advancement counts (None unless advancement is True).
+    seed is None, an int or a SeedSequence. The playoff format defaults to the one
+    matching the number of seeds, the game probability matrix (see Baseball.gameProbs)
+    is computed if not given'''
+
+    if bracket is None:
+        bracket = bracketFor(nl)
+
+    seedSeq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = seedSeq.spawn(workers)
+    shards = [(n, s, record, antithetic, advancement) for n, s in zip(splitTrials(trials, workers), seeds)]
+
+    if workers == 1:
+        # Runs in this process, whose state must not outlive the call
+        initWorker(nl, al, bracket, gameProbs)
+        try:
+            results = [runShard(shards[0])]
+        finally:
+            workerState.clear()
+    else:
+        with Pool(workers, initializer = initWorker, initargs = (nl, al, bracket, gameProbs)) as pool:
+            results = pool.map(runShard, shards, chunksize = 1)
+
+        # Shards count their trials in the worker processes
+        instrumentation.count('trials', trials)
+
+    names = batchSim.bracketArrays(nl, al)[0]
+    counts = np.sum([r[0] for r in results], axis = 0)
+    champions = np.concatenate([r[1] for r in results]) if record else None
+    reached = np.sum([r[2] for r in results], axis = 0) if advancement else None
+
+    return names, counts, champions, reached
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Headless rendering of simulation results.
+
+Charts are drawn on a matplotlib Figure with the non-interactive Agg canvas
+instead of pyplot, so rendering never opens a window or blocks on a server with
+no display, and holds no global pyplot state. The file format (PNG, SVG, ...)
+follows the file extension. Results of several seasons can be rendered in
+parallel, one process per chart.
+"""
+
+import os
+from multiprocessing import Pool
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def drawResults(ax, team, pct, season):
+    '''Function that draws the bargraph of World Series win percentages (team names and
+    percentages in the same order) on the matplotlib axes ax'''
+
+    ax.bar(team, pct, color = 'green')
+
+    # Label and text box over every bar
+    for i in range(len(team)):
+        ax.text(i, pct[i]//2, pct[i], ha = 'center',
+                bbox = dict(boxstyle = 'sawtooth', facecolor = 'yellow', alpha = .6))
+
+    ax.tick_params(axis = 'x', labelrotation = 60)
+    ax.set_title('Odds of Winning the World Series {} Edition - Pitcher WAR'.format(season))
+    ax.set_xlabel("Teams")
+    ax.set_ylabel("Win Percentage")
+
+
+def renderResult(result, path):
+    '''Function that writes the bargraph of a SimulationResult to path, in the format of
+    its extension (.png, .svg, ...), and returns the path'''
+
+    team = []
+    pct = []
+    for name, wins in result.winners():
+        team.append(name)
+        pct.append(round((wins/result.trials) * 100, 2))
+
+    fig = Figure(figsize = (10,5))
+    FigureCanvasAgg(fig)
+
+    drawResults(fig.add_subplot(), team, pct, result.season)
+
+    fig.tight_layout()
+    fig.savefig(path)
+
+    return path
+
+
+def renderSeasons(results, directory = '.', fmt = 'png', workers = None):
+    '''Function that takes a list of SimulationResults (one per season) and writes the
+    bargraph of each to directory as playoffOdds<season>.<fmt>, over a pool of workers
+    processes (one per CPU by default). Returns the list of paths written'''
+
+    paths = [os.path.join(directory, 'playoffOdds{}.{}'.format(result.season, fmt)) for result in results]
+
+    if workers == 1 or len(results) <= 1:
+        return [renderResult(result, path) for result, path in zip(results, paths)]
+
+    with Pool(workers) as pool:
+        return pool.starmap(renderResult, zip(results, paths))
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of simulation results.
+
+A cached run is simulated in blocks of CACHE_BLOCK trials. Block k of a run
+with seed s always uses the random stream SeedSequence(s, spawn_key = (k,)), so
+a run of any length is the sum of its blocks, and a stored run can answer any
+request with the same inputs: the counts of every block are stored, whole blocks
+already on disk are reused, and only the missing blocks are simulated and merged
+in. The last block of a run is partial when trials is not a multiple of
+CACHE_BLOCK. A partial block can't be split or topped up, so a request needing
+a different number of trials from that block simulates it again: at most
+CACHE_BLOCK trials, whether the request is larger or smaller. The merged result
+is the same as a fresh run with the same seed and trials.
+
+Entries are keyed by a hash of everything the result depends on: the content of
+the pitcher and wins files, the teams and seeds of the bracket, the playoff
+format, the model parameters (home field advantage) and the seed. The trial
+count selects blocks within an entry. Entries are .npz files, the least
+recently used ones are deleted once the cache grows over its size limit.
+"""
+
+import hashlib
+import json
+import os
+from multiprocessing import Pool
+import numpy as np
+import batchSim
+import instrumentation
+from seriesTable import SeriesTable
+from simResult import SimulationResult
+from PlayoffSimulator import bracketFor
+
+
+# Number of trials of one block of a cached run, small enough that re-simulating a
+# partial block costs little, large enough that the batch engine runs at full speed
+CACHE_BLOCK = 10000
+
+# Changes whenever cached results of the same inputs would change
+CACHE_VERSION = 2
+
+
+def cacheSeed(seed):
+    '''Function that returns the integer a seed is cached under: the seed itself, or the
+    entropy of a SeedSequence made from an integer (not spawned). None stays None.
+    Raises TypeError for any other seed, a Generator's state can't be keyed'''
+
+    if seed is None:
+        return None
+    if isinstance(seed, np.random.SeedSequence):
+        if isinstance(seed.entropy, (int, np.integer)) and not seed.spawn_key:
+            return int(seed.entropy)
+    elif isinstance(seed, (int, np.integer)) and not isinstance(seed, bool):
+        return int(seed)
+
+    raise TypeError('cached runs need an integer seed or a SeedSequence of one, got {!r}'.format(seed))
+
+
+def simulateBlocks(task):
+    '''Function that takes a (nl, al, bracket, game probability matrix, entropy, blocks)
+    tuple, blocks being a list of (block index, trials), and returns the list of the
+    champion counts and round advancement counts of every block'''
+
+    nl, al, bracket, gameProbs, entropy, blocks = task
+
+    table = SeriesTable(gameProbs, bracket.formats)
+    results = []
+
+    for k, trials in blocks:
+        seedSeq = np.random.SeedSequence(entropy, spawn_key = (k,))
+        names, counts, champions, reached = batchSim.simulateBracket(nl, al, trials, seedSeq, table,
+                                                                     bracket = bracket, advancement = True)
+        results.append((counts, reached))
+
+    return results
+
+
+class ResultCache():
+    '''Persistent cache of batch engine results in directory, holding at most maxBytes
+    of entries'''
+
+    def __init__(self, directory = '.simcache', maxBytes = 256 * 2**20):
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+
+    def key(self, nl, al, bracket, seed, files = ()):
+        '''Function that returns the hex digest identifying a run of the bracket with seed
+        (see cacheSeed). files are the data files the bracket was read from (pitcher WAR and
+        team wins)'''
+
+        h = hashlib.sha256()
+        h.update('version {} block {}'.format(CACHE_VERSION, CACHE_BLOCK).encode())
+
+        for file in files:
+            with open(file, 'rb') as f:
+                h.update(hashlib.sha256(f.read()).digest())
+
+        teams = [[s, str(t[0])] + [float(v) for v in t[1:]]
+                 for league in (nl, al) for s, t in sorted(league.items())]
+        h.update(json.dumps(teams).encode())
+
+        h.update(bracket.name.encode())
+        h.update(repr((bracket.seeds, bracket.formats, bracket.final)).encode())
+        h.update(bracket.steps.tobytes())
+
+        h.update(repr({'homeAdvantage': batchSim.HOME_ADVANTAGE, 'seed': cacheSeed(seed)}).encode())
+
+        return h.hexdigest()
+
+
+    def path(self, key):
+        '''Function that returns the file of the entry of key'''
+
+        return os.path.join(self.directory, key + '.npz')
+
+
+    def load(self, key):
+        '''Function that returns the stored entry of key as a dictionary of arrays, None if
+        there is none. Marks the entry as recently used'''
+
+        path = self.path(key)
+
+        try:
+            with np.load(path) as data:
+                entry = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+
+        os.utime(path)
+
+        return entry
+
+
+    def store(self, key, entry):
+        '''Function that writes an entry and evicts the least recently used entries over
+        the size limit'''
+
+        os.makedirs(self.directory, exist_ok = True)
+
+        # Write then rename, so concurrent readers never see half an entry
+        tmp = '{}.{}.tmp.npz'.format(self.path(key)[:-4], os.getpid())
+        np.savez(tmp, **entry)
+        os.replace(tmp, self.path(key))
+
+        self.evict()
+
+
+    def evict(self):
+        '''Function that deletes the least recently used entries until the cache holds at
+        most maxBytes'''
+
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz') and '.tmp.' not in name:
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for mtime, size, name in entries)
+
+        for mtime, size, name in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+    def clear(self):
+        '''Function that deletes every entry'''
+
+        maxBytes, self.maxBytes = self.maxBytes, -1
+        self.evict()
+        self.maxBytes = maxBytes
+
+
+    def simulate(self, nl, al, trials, seed = None, bracket = None, season = None, files = (), workers = 1,
+                 gameProbs = None):
+        '''Function that returns the SimulationResult of trials brackets with seed, from the
+        cache when it holds them. Missing blocks are simulated, over a pool of workers
+        processes if workers is more than 1, and stored. gameProbs is the game probability
+        matrix of the bracket (see Baseball.gameProbs), computed if not given.
+        seed is an integer or a SeedSequence of one (see cacheSeed). Blocks draw from streams
+        spawned from the seed, so the counts differ from an uncached run with the same seed.
+        An unseeded run has nothing to be found under: it is simulated and not stored'''
+
+        seed = cacheSeed(seed)
+
+        if bracket is None:
+            bracket = bracketFor(nl)
+        if gameProbs is None:
+            gameProbs = batchSim.gameProbabilities(batchSim.bracketArrays(nl, al)[1])
+
+        if seed is None:
+            key = None
+            entry = None
+        else:
+            key = self.key(nl, al, bracket, seed, files)
+            entry = self.load(key)
+
+        names = batchSim.bracketArrays(nl, al)[0]
+        rounds = bracket.advancementRounds()
+
+        if entry is None:
+            entropy = seed if seed is not None else np.random.SeedSequence().entropy
+            entry = {'entropy': np.array(str(entropy)),
+                     'blockTrials': np.zeros(0, dtype = np.int64),
+                     'blockCounts': np.zeros((0, len(names)), dtype = np.int64),
+                     'blockReached': np.zeros((0, len(rounds), len(names)), dtype = np.int64)}
+        entropy = int(entry['entropy'])
+
+        # Trials of every block of the run, the last one can be partial
+        sizes = [min(CACHE_BLOCK, trials - start) for start in range(0, trials, CACHE_BLOCK)]
+        cached = entry['blockTrials']
+        missing = [k for k, n in enumerate(sizes) if k >= len(cached) or cached[k] != n]
+
+        reuse = [k for k in range(len(sizes)) if k not in missing]
+        counts = entry['blockCounts'][reuse].sum(axis = 0)
+        reached = entry['blockReached'][reuse].sum(axis = 0)
+        instrumentation.count('cached trials', sum(sizes[k] for k in reuse))
+
+        if missing:
+            if workers > 1 and len(missing) > 1:
+                # One task of consecutive blocks per worker
+                groups = np.array_split(np.array(missing), min(workers, len(missing)))
+                tasks = [(nl, al, bracket, gameProbs, entropy, [(int(k), sizes[k]) for k in group])
+                         for group in groups]
+                with Pool(len(tasks)) as pool:
+                    blocks = [block for result in pool.map(simulateBlocks, tasks, chunksize = 1)
+                              for block in result]
+                instrumentation.count('trials', sum(sizes[k] for k in missing))
+            else:
+                blocks = simulateBlocks((nl, al, bracket, gameProbs, entropy,
+                                         [(k, sizes[k]) for k in missing]))
+
+            # Grow the entry to the longest run seen. A block replaces the stored one when it
+            # has more trials, a shorter partial block is only used for this run
+            n = max(len(cached), len(sizes))
+            grown = {'blockTrials': np.zeros(n, dtype = np.int64),
+                     'blockCounts': np.zeros((n, len(names)), dtype = np.int64),
+                     'blockReached': np.zeros((n, len(rounds), len(names)), dtype = np.int64)}
+            for name, array in grown.items():
+                array[:len(cached)] = entry[name]
+
+            for k, (blockCounts, blockReached) in zip(missing, blocks):
+                counts = counts + blockCounts
+                reached = reached + blockReached
+
+                if sizes[k] > grown['blockTrials'][k]:
+                    grown['blockTrials'][k] = sizes[k]
+                    grown['blockCounts'][k] = blockCounts
+                    grown['blockReached'][k] = blockReached
+
+            entry.update(grown)
+            if key is not None:
+                self.store(key, entry)
+
+        return SimulationResult(names, counts, trials, season, reached, rounds)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Comparison of bracket scenarios with variance reduction.
+
+Every scenario (for example the same bracket with a team's #1 starter WAR
+changed) is simulated with common random numbers: each chunk of trials replays
+the same seed for every scenario, so the same uniforms decide the same series
+and the difference between scenarios is not drowned in simulation noise.
+Optionally every trial is paired with its antithetic twin (1 - u for every u).
+"""
+
+import numpy as np
+from batchSim import (bracketArrays, gameProbabilities, simulateChunk, makePlay,
+                      chunkSeed, AntitheticGenerator, CHUNK_SIZE)
+from seriesTable import SeriesTable
+from PlayoffSimulator import bracketFor
+
+
+def compareScenarios(brackets, trials, seed = None, antithetic = False, perGame = False, bracket = None,
+                     gameProbs = None):
+    '''Function that takes a list of (nl, al) brackets with the same teams in the same
+    seeds, the first being the base scenario, and simulates all of them with common
+    random numbers.
+    If antithetic is True, trials are simulated as antithetic pairs.
+    If perGame is True, every game is played instead of drawing every series from its
+    memoized win probability.
+    The playoff format defaults to the one matching the number of seeds. gameProbs is the
+    list of the game probability matrices of the scenarios (see Baseball.gameProbs),
+    computed if not given.
+    Returns the team names and three (scenarios, teams) arrays: the title odds, the
+    difference in title odds with the base scenario and its standard error'''
+
+    if bracket is None:
+        bracket = bracketFor(brackets[0][0])
+
+    if gameProbs is None:
+        gameProbs = [None] * len(brackets)
+
+    setups = []
+    for (nl, al), probs in zip(brackets, gameProbs):
+        names, strength, wins = bracketArrays(nl, al)
+        if probs is None:
+            probs = gameProbabilities(strength)
+        table = None if perGame else SeriesTable(probs, bracket.formats)
+        setups.append((probs, table, wins, len(nl)))
+
+    rng = np.random.default_rng(seed)
+    teams = np.arange(len(names))
+
+    # Sums over independent units (single trials, or antithetic pairs) of the title
+    # indicator of every scenario and of its difference with the base scenario
+    odds = np.zeros((len(brackets), len(names)))
+    deltaSum = np.zeros((len(brackets), len(names)))
+    deltaSquares = np.zeros((len(brackets), len(names)))
+    units = 0
+
+    for start in range(0, trials, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, trials - start)
+        s = chunkSeed(rng)
+        size = (n + 1) // 2 if antithetic else n
+
+        indicators = []
+        for probs, table, wins, nTeams in setups:
+
+            # Same seed for every scenario gives common random numbers
+            champs = [simulateChunk(makePlay(probs, table, np.random.default_rng(s)), bracket, wins, nTeams, size)]
+            if antithetic:
+                champs.append(simulateChunk(makePlay(probs, table, AntitheticGenerator(s)), bracket, wins,
+                                            nTeams, size))
+
+            # Title indicator of every team averaged over each unit, shape (size, teams)
+            indicators.append(np.mean([c[:, None] == teams for c in champs], axis = 0))
+
+        for i in range(len(setups)):
+            delta = indicators[i] - indicators[0]
+            odds[i] += indicators[i].sum(axis = 0)
+            deltaSum[i] += delta.sum(axis = 0)
+            deltaSquares[i] += (delta ** 2).sum(axis = 0)
+
+        units += size
+
+    odds /= units
+    delta = deltaSum / units
+    stdError = np.sqrt(np.maximum(deltaSquares / units - delta ** 2, 0) / units)
+
+    return names, odds, delta, stdError
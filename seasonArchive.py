@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Season files read straight from archives.
+
+A data bundle can be a zip file (like PitcherWARSim.zip) or a tar file,
+compressed or not, holding the TeamPitchers and TeamWins files of any number of
+seasons, at the top or in subdirectories. Members are streamed out of the
+archive and parsed in memory (see seasonData), nothing is extracted to disk.
+A SeasonArchive keeps the archive open, so every season is read in one open:
+
+    with SeasonArchive('PitcherWARSim.zip') as archive:
+        teams = {season: archive.teams(season) for season in archive.seasons()}
+
+Everywhere a data directory is taken (seasons.loadBracket, multiSeason,
+cli.py --data), an archive path can be given instead.
+"""
+
+import os
+import posixpath
+import re
+import tarfile
+import zipfile
+import seasonData
+
+
+# Extensions of the archives that can be read
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# Season and kind of a data file name
+DATA_FILE = re.compile(r'^(\d{4})Team(Pitchers|Wins)\.txt$')
+
+
+def isArchive(path):
+    '''Function that returns True if path is an archive file that can hold season files'''
+
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+
+class SeasonArchive():
+    '''Season files of a zip or tar archive, kept open until close (or the end of a with
+    block)'''
+
+    def __init__(self, path):
+        self.path = path
+
+        if zipfile.is_zipfile(path):
+            self.zip = zipfile.ZipFile(path)
+            self.tar = None
+            members = [info.filename for info in self.zip.infolist() if not info.is_dir()]
+        else:
+            self.zip = None
+            self.tar = tarfile.open(path)
+            members = [info.name for info in self.tar.getmembers() if info.isfile()]
+
+        # {(season, 'Pitchers' or 'Wins'): member}, the first match in archive order
+        self.members = {}
+        for member in members:
+            match = DATA_FILE.match(posixpath.basename(member))
+            if match:
+                self.members.setdefault((int(match.group(1)), match.group(2)), member)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+        if self.tar is not None:
+            self.tar.close()
+
+
+    def seasons(self):
+        '''Function that returns the sorted list of seasons with both files in the archive'''
+
+        return sorted(season for season, kind in self.members
+                      if kind == 'Pitchers' and (season, 'Wins') in self.members)
+
+
+    def read(self, season, kind):
+        '''Function that returns the text of the 'Pitchers' or 'Wins' file of a season'''
+
+        member = self.members.get((season, kind))
+        if member is None:
+            raise ValueError('{}: no {}Team{}.txt'.format(self.path, season, kind))
+
+        if self.zip is not None:
+            data = self.zip.read(member)
+        else:
+            with self.tar.extractfile(member) as f:
+                data = f.read()
+
+        return data.decode('utf-8')
+
+
+    def loadSeason(self, season):
+        '''Function that returns the SeasonData of a season'''
+
+        source = '{}:{}TeamWins.txt'.format(self.path, season)
+        data = seasonData.parsePitchers(self.read(season, 'Pitchers'), '{}:{}TeamPitchers.txt'.format(self.path,
+                                                                                                     season))
+
+        return seasonData.withWins(data, seasonData.parseWins(self.read(season, 'Wins')), source)
+
+
+    def teams(self, season):
+        '''Function that returns the dictionary of every team of a season and its
+        [name, p1, p2, p3, wins] list (see seasonData.SeasonData.teams)'''
+
+        return self.loadSeason(season).teams()
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Binary bundle of the team data of every season.
+
+The TeamPitchers and TeamWins files of every season in a data directory are
+parsed once (see seasonData) into a single structured NumPy array with one row
+per team and season: season, team ID (see teamRegistry), team name, starter
+WAR, reliever WAR and wins.
+The array is written as an .npy file, so it is opened memory-mapped instead of
+being read or parsed. A small JSON index next to it keeps the modification
+time, size and SHA-256 of every source file.
+
+openBundle checks the index against the source files (one stat per file, files
+are only hashed when their modification time or size changed) and rebuilds the
+bundle when a source file was added, removed or changed. Worker processes can
+skip the check once the parent has done it.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import numpy as np
+import seasonData
+import seasons
+
+
+# Changes whenever the layout of the bundle changes
+BUNDLE_VERSION = 2
+
+# Directory of the bundle, inside the data directory
+BUNDLE_DIRECTORY = '.seasondata'
+
+# Season of a TeamPitchers file name
+PITCHER_FILE = re.compile(r'^(\d{4})TeamPitchers\.txt$')
+
+
+def dataSeasons(directory = '.'):
+    '''Function that returns the sorted list of seasons with a TeamPitchers file in directory'''
+
+    found = []
+    for path in glob.glob(os.path.join(directory, '*TeamPitchers.txt')):
+        match = PITCHER_FILE.match(os.path.basename(path))
+        if match:
+            found.append(int(match.group(1)))
+
+    return sorted(found)
+
+
+def fileHash(path):
+    '''Function that returns the SHA-256 hex digest of a file'''
+
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def fingerprint(path):
+    '''Function that returns the [modification time (ns), size, sha256] of a source file'''
+
+    stat = os.stat(path)
+
+    return [stat.st_mtime_ns, stat.st_size, fileHash(path)]
+
+
+class SeasonBundle():
+    '''Team data of every season of a bundle. rows is the structured array (memory-mapped
+    when opened from disk) with fields season, team, name, starters, relievers and wins'''
+
+    def __init__(self, rows):
+        self.rows = rows
+
+
+    def seasons(self):
+        '''Function that returns the sorted list of seasons in the bundle'''
+
+        return [int(s) for s in np.unique(self.rows['season'])]
+
+
+    def season(self, season):
+        '''Function that returns the SeasonData of one season, its arrays being views of the
+        bundle'''
+
+        start, stop = np.searchsorted(self.rows['season'], [season, season + 1])
+        if start == stop:
+            raise ValueError('No data for season {} in the bundle'.format(season))
+
+        rows = self.rows[start:stop]
+
+        return seasonData.SeasonData([str(name) for name in rows['name']], rows['starters'], rows['relievers'],
+                                     rows['wins'], rows['team'].astype(np.int64))
+
+
+    def teams(self, season):
+        '''Function that returns the dictionary of every team of a season and its
+        [name, p1, p2, p3, wins] list (see seasonData.SeasonData.teams)'''
+
+        return self.season(season).teams()
+
+
+def bundleRows(seasonList, directory = '.'):
+    '''Function that parses the files of every season and returns the structured array of
+    a bundle, sorted by season'''
+
+    data = {season: seasonData.loadSeason(*seasons.seasonFiles(season, directory)) for season in seasonList}
+    width = max([len(name) for d in data.values() for name in d.names] + [1])
+
+    dtype = np.dtype([('season', np.int32), ('team', np.int16), ('name', 'U{}'.format(width)),
+                      ('starters', np.float64, seasonData.STARTERS), ('relievers', np.float64, seasonData.RELIEVERS),
+                      ('wins', np.float64)])
+    rows = np.zeros(sum(len(d.names) for d in data.values()), dtype = dtype)
+
+    i = 0
+    for season in sorted(data):
+        d = data[season]
+        n = len(d.names)
+        rows['season'][i:i + n] = season
+        rows['team'][i:i + n] = d.ids
+        rows['name'][i:i + n] = d.names
+        rows['starters'][i:i + n] = d.starters
+        rows['relievers'][i:i + n] = d.relievers
+        rows['wins'][i:i + n] = d.wins
+        i += n
+
+    return rows
+
+
+def bundlePaths(directory = '.'):
+    '''Function that returns the paths of the array and index files of the bundle of a data
+    directory'''
+
+    bundle = os.path.join(directory, BUNDLE_DIRECTORY)
+
+    return os.path.join(bundle, 'teams.npy'), os.path.join(bundle, 'index.json')
+
+
+def buildBundle(directory = '.'):
+    '''Function that parses the files of every season of the data directory, writes the
+    bundle and returns it as a SeasonBundle'''
+
+    arrayPath, indexPath = bundlePaths(directory)
+    os.makedirs(os.path.dirname(arrayPath), exist_ok = True)
+
+    seasonList = dataSeasons(directory)
+    sources = {os.path.basename(path): fingerprint(path)
+               for season in seasonList for path in seasons.seasonFiles(season, directory)}
+    rows = bundleRows(seasonList, directory)
+
+    # Write then rename, so concurrent readers never see half a file. The index goes last,
+    # a reader seeing a new array with an old index only rebuilds once more
+    tmp = '{}.{}.tmp'.format(arrayPath, os.getpid())
+    with open(tmp, 'wb') as f:
+        np.save(f, rows)
+    os.replace(tmp, arrayPath)
+
+    tmp = '{}.{}.tmp'.format(indexPath, os.getpid())
+    with open(tmp, 'w') as f:
+        json.dump({'version': BUNDLE_VERSION, 'sources': sources}, f, indent = 1)
+    os.replace(tmp, indexPath)
+
+    return SeasonBundle(rows)
+
+
+def isCurrent(directory = '.'):
+    '''Function that returns True if the bundle of the data directory exists and matches
+    every source file. Files whose modification time changed but whose content did not
+    have their new time written to the index, so they are not hashed again'''
+
+    arrayPath, indexPath = bundlePaths(directory)
+
+    try:
+        with open(indexPath) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if index.get('version') != BUNDLE_VERSION or not os.path.exists(arrayPath):
+        return False
+
+    sources = index['sources']
+    current = {os.path.basename(path) for season in dataSeasons(directory)
+               for path in seasons.seasonFiles(season, directory)}
+    if current != set(sources):
+        return False
+
+    touched = False
+    for name, (mtime, size, digest) in sources.items():
+        path = os.path.join(directory, name)
+        stat = os.stat(path)
+
+        if stat.st_mtime_ns == mtime and stat.st_size == size:
+            continue
+        if stat.st_size != size or fileHash(path) != digest:
+            return False
+
+        sources[name] = [stat.st_mtime_ns, size, digest]
+        touched = True
+
+    if touched:
+        tmp = '{}.{}.tmp'.format(indexPath, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent = 1)
+        os.replace(tmp, indexPath)
+
+    return True
+
+
+def openBundle(directory = '.', check = True):
+    '''Function that returns the SeasonBundle of the data directory, memory-mapped.
+    If check is True, the bundle is first checked against the source files and rebuilt
+    if it is missing or out of date. check = False skips the check, for worker processes
+    of a parent that already opened the bundle'''
+
+    if check and not isCurrent(directory):
+        buildBundle(directory)
+
+    return SeasonBundle(np.load(bundlePaths(directory)[0], mmap_mode = 'r'))
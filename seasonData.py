@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Loader of the TeamPitchers and TeamWins files of a season.
+
+TeamPitchers files (https://www.baseball-reference.com/leagues/majors/2022-team-pitching-staffs.shtml)
+have a header line, then one line per team with its rank, name, five starting
+pitchers and four relievers, each as 'Name (WAR)'. TeamWins files have no
+header, one 'Team name, wins' line per team (wins can be left blank).
+
+Each file is read in a single pass with compiled patterns into typed NumPy
+arrays, without pandas. The strength of a team is the WAR of each of its top
+three starters plus the mean WAR of its four relievers, rounded to 2 decimals.
+Building the team lists always returns new lists, so loading a season twice
+gives the same result.
+"""
+
+import re
+import numpy as np
+import teamRegistry
+
+
+# One team line of a TeamPitchers file: rank, team name, then the pitcher cells
+TEAM_LINE = re.compile(r'^\d+,([^,\r\n]+),(.*)$', re.M)
+
+# WAR of every pitcher cell, e.g. 'M.Kelly (3.55)' or 'M.Bumgarner (-0.75)'
+WAR = re.compile(r'\((-?\d+\.\d+)\)')
+
+# One line of a TeamWins file, with Unix or Windows line ends
+WINS_LINE = re.compile(r'^([^,\r\n]+),[ \t]*(\d*)[ \t\r]*$', re.M)
+
+# Starters and relievers of every team line
+STARTERS = 5
+RELIEVERS = 4
+
+
+class SeasonData():
+    '''Pitching staffs and regular season wins of every team of a season.
+    names is the list of team names in file order, starters a (teams, 5) and relievers
+    a (teams, 4) float64 array of pitcher WAR in file order, wins a float64 array of
+    regular season wins, NaN where the wins file has none (None if no wins file was read).
+    ids is the int64 array of the team IDs of teamRegistry, looked up from the names if
+    not given, -1 for names teamRegistry does not know'''
+
+    def __init__(self, names, starters, relievers, wins = None, ids = None):
+        self.names = names
+        if ids is None:
+            ids = np.array([-1 if i is None else i for i in map(teamRegistry.find, names)], dtype = np.int64)
+
+        self.ids = ids
+        self.starters = starters
+        self.relievers = relievers
+        self.wins = wins
+
+
+    def strength(self):
+        '''Function that returns the (teams, 3) array of team strengths: the WAR of the top 3
+        starters, highest first, each plus the mean WAR of the bullpen'''
+
+        top = -np.sort(-self.starters, axis = 1)[:, :3]
+
+        return np.round(top + self.relievers.mean(axis = 1)[:, None], decimals = 2)
+
+
+    def teams(self):
+        '''Function that returns a new dictionary of every team and its [name, p1, p2, p3, wins]
+        list ([name, p1, p2, p3] without wins), the format of the bracket dictionaries'''
+
+        strength = self.strength()
+        teams = {}
+
+        for i, name in enumerate(self.names):
+            team = [name] + list(strength[i])
+            if self.wins is not None:
+                team.append(int(self.wins[i]) if np.isfinite(self.wins[i]) else np.nan)
+            teams[name] = team
+
+        return teams
+
+
+def parsePitchers(text, source = 'TeamPitchers'):
+    '''Function that parses the text of a TeamPitchers file and returns a SeasonData without
+    wins. source names the file in error messages'''
+
+    names = []
+    war = []
+    for line in TEAM_LINE.finditer(text):
+        values = WAR.findall(line.group(2))
+        if len(values) != STARTERS + RELIEVERS:
+            raise ValueError('{}: expected {} pitchers for {}, found {}'.format(
+                source, STARTERS + RELIEVERS, line.group(1), len(values)))
+        names.append(line.group(1))
+        war.append(values)
+
+    war = np.array(war, dtype = np.float64).reshape(len(names), STARTERS + RELIEVERS)
+
+    return SeasonData(names, war[:, :STARTERS], war[:, STARTERS:])
+
+
+def readPitchers(file):
+    '''Function that reads a TeamPitchers file and returns a SeasonData without wins'''
+
+    with open(file, encoding = 'utf-8') as f:
+        return parsePitchers(f.read(), file)
+
+
+def parseWins(text):
+    '''Function that parses the text of a TeamWins file and returns a dictionary of every
+    team and its regular season wins, NaN if left blank'''
+
+    return {line.group(1).strip(): int(line.group(2)) if line.group(2) else np.nan
+            for line in WINS_LINE.finditer(text)}
+
+
+def readWins(file):
+    '''Function that reads a TeamWins file and returns a dictionary of every team and its
+    regular season wins, NaN if left blank'''
+
+    with open(file, encoding = 'utf-8') as f:
+        return parseWins(f.read())
+
+
+def withWins(data, wins, source = 'TeamWins'):
+    '''Function that takes a SeasonData and a dictionary of team wins and returns the
+    SeasonData with its wins array set. Every team must have wins'''
+
+    missing = [name for name in data.names if name not in wins]
+    if missing:
+        raise ValueError('{}: no wins for {}'.format(source, ', '.join(missing)))
+
+    data.wins = np.array([wins[name] for name in data.names], dtype = np.float64)
+
+    return data
+
+
+def loadSeason(pitcherFile, winsFile):
+    '''Function that reads the pitcher and wins files of a season and returns its SeasonData'''
+
+    return withWins(readPitchers(pitcherFile), readWins(winsFile), winsFile)
+
+
+def addWins(teams, file):
+    '''Function that takes a dictionary of teams ({name: [name, p1, p2, p3, ...]}) and returns
+    a new dictionary with the wins of the TeamWins file as the fifth element of every list.
+    The dictionary passed in is not changed, so calling it again gives the same result'''
+
+    wins = readWins(file)
+
+    missing = [name for name in teams if name not in wins]
+    if missing:
+        raise ValueError('{}: no wins for {}'.format(file, ', '.join(missing)))
+
+    return {name: list(team[:4]) + [wins[name]] for name, team in teams.items()}
+
+
+def extractWAR(arr):
+    '''Function that takes a row of a TeamPitchers file (rank, team name, then nine pitcher
+    cells) and returns [team name, p1, p2, p3], the WAR of the top 3 starters each plus
+    the mean WAR of the four relievers'''
+
+    war = [float(WAR.search(cell).group(1)) for cell in arr[2:2 + STARTERS + RELIEVERS]]
+
+    data = SeasonData([arr[1]], np.array([war[:STARTERS]]), np.array([war[STARTERS:]]))
+
+    return data.teams()[arr[1]]
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming statistics of simulated regular seasons.
+
+SeasonStats is fed the wins and final ratings of the simulated seasons chunk by
+chunk (see eloSeason.seasonChunks) and keeps, for every team, the mean and
+variance of its wins and rating (merged chunk by chunk, Chan et al.), the full
+distribution of its win totals and a histogram of its final rating. Memory
+only depends on the number of teams, not on the number of seasons, so 10/50/90
+projections of any number of seasons are read from the histograms without
+keeping the seasons.
+
+Win percentiles are exact. Rating percentiles are exact to ELO_BIN points,
+ratings more than ELO_RANGE points away from the preseason rating are counted
+in the first or last bin.
+"""
+
+import numpy as np
+
+
+# Width (Elo points) of the bins of the rating histograms
+ELO_BIN = 0.25
+
+# Rating histograms cover the preseason rating plus or minus ELO_RANGE points
+ELO_RANGE = 200
+
+
+def mergeMoments(count, mean, m2, n, chunkMean, chunkM2):
+    '''Function that merges the count, mean and sum of squared deviations of a chunk
+    of n values into running ones and returns the new mean and sum of squared deviations'''
+
+    total = count + n
+    delta = chunkMean - mean
+
+    return mean + delta * n / total, m2 + chunkM2 + delta**2 * count * n / total
+
+
+def histogramPercentiles(histogram, percentiles):
+    '''Function that returns, for every row of a histogram, the index of the first bin at
+    which the cumulative count reaches each percentile, shape (rows, percentiles)'''
+
+    cumulative = np.cumsum(histogram, axis = 1)
+    targets = cumulative[:, -1:] * np.asarray(percentiles, dtype = np.float64)[None, :] / 100
+
+    return np.array([np.searchsorted(row, target) for row, target in zip(cumulative, targets)])
+
+
+class SeasonStats():
+    '''Running statistics of the simulated seasons of teams, the list of team names.
+    ratings is the array of their preseason ratings, maxWins the most games any team
+    can win (the size of the win histograms is maxWins + 1)'''
+
+    def __init__(self, teams, ratings, maxWins, eloBin = ELO_BIN, eloRange = ELO_RANGE):
+        self.teams = list(teams)
+        self.ratings = np.asarray(ratings, dtype = np.float64)
+        self.eloBin = eloBin
+        self.eloRange = eloRange
+        self.count = 0
+
+        n = len(self.teams)
+        self.winsMean = np.zeros(n)
+        self.winsM2 = np.zeros(n)
+        self.eloMean = np.zeros(n)
+        self.eloM2 = np.zeros(n)
+
+        self.winsHistogram = np.zeros((n, maxWins + 1), dtype = np.int64)
+        self.eloHistogram = np.zeros((n, int(round(2 * eloRange / eloBin))), dtype = np.int64)
+
+
+    def update(self, wins, elo):
+        '''Function that adds a chunk of seasons: wins and elo are (teams, seasons) arrays in
+        the order of self.teams'''
+
+        n = wins.shape[1]
+        if n == 0:
+            return
+
+        teams, winBins = self.winsHistogram.shape
+        eloBins = self.eloHistogram.shape[1]
+        offset = np.arange(teams)[:, None]
+
+        w = wins.astype(np.float64)
+        chunkMean = w.mean(axis = 1)
+        self.winsMean, self.winsM2 = mergeMoments(self.count, self.winsMean, self.winsM2, n, chunkMean,
+                                                  ((w - chunkMean[:, None])**2).sum(axis = 1))
+
+        chunkMean = elo.mean(axis = 1)
+        self.eloMean, self.eloM2 = mergeMoments(self.count, self.eloMean, self.eloM2, n, chunkMean,
+                                                ((elo - chunkMean[:, None])**2).sum(axis = 1))
+        self.count += n
+
+        # One bincount for every team, each team row offset by its own block of bins
+        index = wins.astype(np.int64) + offset * winBins
+        self.winsHistogram += np.bincount(index.ravel(), minlength = teams * winBins).reshape(teams, winBins)
+
+        bins = np.floor((elo - self.ratings[:, None] + self.eloRange) / self.eloBin).astype(np.int64)
+        index = np.clip(bins, 0, eloBins - 1) + offset * eloBins
+        self.eloHistogram += np.bincount(index.ravel(), minlength = teams * eloBins).reshape(teams, eloBins)
+
+
+    def winsVariance(self):
+        '''Function that returns the sample variance of the wins of every team'''
+
+        return self.winsM2 / max(self.count - 1, 1)
+
+
+    def eloVariance(self):
+        '''Function that returns the sample variance of the final rating of every team'''
+
+        return self.eloM2 / max(self.count - 1, 1)
+
+
+    def winsPercentiles(self, percentiles = (10, 50, 90)):
+        '''Function that returns the (teams, percentiles) array of win totals: for each
+        percentile q, the lowest total that at least q percent of the seasons do not exceed'''
+
+        return histogramPercentiles(self.winsHistogram, percentiles)
+
+
+    def eloPercentiles(self, percentiles = (10, 50, 90)):
+        '''Function that returns the (teams, percentiles) array of final ratings, the middle
+        of the histogram bin of each percentile'''
+
+        bins = histogramPercentiles(self.eloHistogram, percentiles)
+
+        return self.ratings[:, None] - self.eloRange + (bins + 0.5) * self.eloBin
+
+
+    def winDistribution(self):
+        '''Function that returns the (teams, maxWins + 1) array of the odds of every team
+        ending the season with each win total'''
+
+        return self.winsHistogram / max(self.count, 1)
+
+
+    def frame(self, percentiles = (10, 50, 90)):
+        '''Function that returns a pandas dataframe indexed by team with the mean, standard
+        deviation and percentiles of the wins and final rating of every team, sorted by
+        mean wins'''
+
+        import pandas as pd
+
+        df = pd.DataFrame({'Predicted Wins': self.winsMean, 'Predicted Elo': self.eloMean,
+                           'Wins SD': np.sqrt(self.winsVariance()), 'Elo SD': np.sqrt(self.eloVariance())},
+                          index = self.teams)
+
+        wins = self.winsPercentiles(percentiles)
+        elo = self.eloPercentiles(percentiles)
+        for i, q in enumerate(percentiles):
+            df['Wins P{}'.format(q)] = wins[:, i]
+        for i, q in enumerate(percentiles):
+            df['Elo P{}'.format(q)] = elo[:, i]
+
+        return df.sort_values(by = 'Predicted Wins', ascending = False)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Postseason brackets of every season with data files in the repository.
+
+Each season is the list of NL and AL playoff teams in seed order, using the team
+names of the season's TeamPitchers file ((W) is the World Series winner, (RU)
+the runner up). The playoff format follows from the number of seeds (see
+PlayoffSimulator.BRACKETS).
+
+The data of a season is read from a directory or from an archive of season
+files (see seasonArchive), wherever a directory is taken.
+"""
+
+import os
+
+
+# {season: ([NL teams by seed], [AL teams by seed])}
+SEASONS = {
+    2016: (['Chicago Cubs (W)', 'Washington Nationals', 'Los Angeles Dodgers', 'New York Mets',
+            'San Francisco Giants'],
+           ['Texas Rangers', 'Cleveland Indians (RU)', 'Boston Red Sox', 'Toronto Blue Jays',
+            'Baltimore Orioles']),
+    2018: (['Milwaukee Brewers', 'Los Angeles Dodgers (RU)', 'Atlanta Braves', 'Chicago Cubs',
+            'Colorado Rockies'],
+           ['Boston Red Sox (W)', 'Houston Astros', 'Cleveland Indians', 'New York Yankees',
+            'Oakland Athletics']),
+    2019: (['Los Angeles Dodgers', 'Atlanta Braves', 'St. Louis Cardinals', 'Washington Nationals (W)',
+            'Milwaukee Brewers'],
+           ['Houston Astros (RU)', 'New York Yankees', 'Minnesota Twins', 'Oakland Athletics',
+            'Tampa Bay Rays']),
+    2020: (['Los Angeles Dodgers', 'Atlanta Braves', 'Chicago Cubs', 'San Diego Padres',
+            'St. Louis Cardinals', 'Miami Marlins', 'Cincinnati Reds', 'Milwaukee Brewers'],
+           ['Tampa Bay Rays', 'Oakland Athletics', 'Minnesota Twins', 'Cleveland Indians',
+            'New York Yankees', 'Houston Astros', 'Chicago White Sox', 'Toronto Blue Jays']),
+    2021: (['San Francisco Giants', 'Milwaukee Brewers', 'Atlanta Braves (W)', 'Los Angeles Dodgers',
+            'St. Louis Cardinals'],
+           ['Tampa Bay Rays', 'Houston Astros (RU)', 'Chicago White Sox', 'Boston Red Sox',
+            'New York Yankees']),
+    2022: (['Los Angeles Dodgers', 'Atlanta Braves', 'St. Louis Cardinals', 'New York Mets',
+            'San Diego Padres', 'Philadelphia Phillies (RU)'],
+           ['Houston Astros (W)', 'New York Yankees', 'Cleveland Guardians', 'Toronto Blue Jays',
+            'Seattle Mariners', 'Tampa Bay Rays']),
+}
+
+
+def seasonFiles(season, directory = '.'):
+    '''Function that returns the paths of the pitcher WAR and team wins files of a season'''
+
+    return (os.path.join(directory, '{}TeamPitchers.txt'.format(season)),
+            os.path.join(directory, '{}TeamWins.txt'.format(season)))
+
+
+def dataFiles(season, directory = '.'):
+    '''Function that returns the paths of the files a season is read from: the archive if
+    directory is one (see seasonArchive), its pitcher WAR and team wins files otherwise'''
+
+    import seasonArchive
+
+    if seasonArchive.isArchive(directory):
+        return (directory,)
+
+    return seasonFiles(season, directory)
+
+
+def loadTeams(season, directory = '.'):
+    '''Function that reads the data files of a season and returns the dictionary of every
+    team and its [name, p1, p2, p3, wins] list. The files are read from the binary bundle
+    of the directory (see seasonBundle), which is rebuilt when they change. If the bundle
+    cannot be written, the files are parsed directly. directory can also be an archive'''
+
+    import seasonArchive
+    import seasonBundle
+    import seasonData
+
+    if seasonArchive.isArchive(directory):
+        with seasonArchive.SeasonArchive(directory) as archive:
+            return archive.teams(season)
+
+    try:
+        bundle = seasonBundle.openBundle(directory)
+    except OSError:
+        return seasonData.loadSeason(*seasonFiles(season, directory)).teams()
+
+    return bundle.teams(season)
+
+
+def seasonBracket(season, teams):
+    '''Function that takes a season and its dictionary of teams (see loadTeams) and
+    returns the nl and al dictionaries of seeds of its postseason'''
+
+    if season not in SEASONS:
+        raise ValueError('No postseason bracket for season {}'.format(season))
+
+    nlTeams, alTeams = SEASONS[season]
+
+    nl = {s + 1: teams[name] for s, name in enumerate(nlTeams)}
+    al = {s + 1: teams[name] for s, name in enumerate(alTeams)}
+
+    return nl, al
+
+
+def loadBracket(season, directory = '.'):
+    '''Function that reads the data files of a season and returns the nl and al
+    dictionaries of seeds of its postseason'''
+
+    return loadBrackets([season], directory)[season]
+
+
+def loadBrackets(seasonList, directory = '.'):
+    '''Function that reads the data files of every season of seasonList and returns a
+    dictionary of every season and its (nl, al) dictionaries of seeds. An archive is
+    opened once for all the seasons'''
+
+    import instrumentation
+    import seasonArchive
+
+    with instrumentation.phase('load'):
+        if seasonArchive.isArchive(directory):
+            with seasonArchive.SeasonArchive(directory) as archive:
+                return {season: seasonBracket(season, archive.teams(season)) for season in seasonList}
+
+        return {season: seasonBracket(season, loadTeams(season, directory)) for season in seasonList}
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Memoized series win probabilities.
+
+P(series win) only depends on the two teams' pitcher strengths, the series
+length, the home pattern and the pitcher rotation, which together fix the odds
+of every game of the series. Each sequence of game odds is computed once and
+kept in a bounded LRU cache, so what-if sweeps over many hypothetical pitchers
+do not grow memory without limit. SeriesTable holds the dense table of every
+pairing in a bracket and is shared by the Monte Carlo and exact engines.
+"""
+
+from functools import lru_cache
+import numpy as np
+from batchSim import HOME, AWAY
+
+
+# Maximum number of series (sequences of game odds) kept in memory
+CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize = CACHE_SIZE)
+def seriesWinProbability(gameOdds):
+    '''Function that takes a tuple with the odds of the series home team winning each
+    game of the series and returns the probability of it winning the series.
+    Walks the series game by game over (home wins, away wins) states and stops a branch
+    once one team has won enough games'''
+
+    games = len(gameOdds)
+    need = games // 2 + 1
+
+    # states[i][j] is the probability of home having i wins and away having j wins
+    states = np.zeros((need + 1, need + 1))
+    states[0][0] = 1.0
+
+    for p in gameOdds:
+        nextStates = np.zeros_like(states)
+        nextStates[need, :] = states[need, :]               # Series already over
+        nextStates[:, need] += states[:, need]
+
+        for i in range(need):
+            for j in range(need):
+                if states[i][j] == 0:
+                    continue
+                nextStates[i + 1][j] += states[i][j] * p
+                nextStates[i][j + 1] += states[i][j] * (1 - p)
+
+        states = nextStates
+
+    return float(states[need, :].sum())
+
+
+class SeriesTable():
+    '''Table of P(series win) for every pairing of the teams of one bracket and
+    every series format'''
+
+    def __init__(self, gameProbs, formats = ()):
+        '''Takes the game probability matrix of the bracket (see batchSim.gameProbabilities)
+        and the series formats to tabulate up front, other formats are tabulated on
+        first use'''
+
+        self.gameProbs = gameProbs
+        self.tables = {}
+
+        for series in formats:
+            self.tables[series] = self.buildTable(series)
+
+
+    def gameOdds(self, home, away, series):
+        '''Function that returns the tuple of odds of team home winning each game of the
+        series against team away'''
+
+        homePattern, rotation = series
+
+        return tuple(float(self.gameProbs[home, away, slot - 1, HOME if atHome else AWAY])
+                     for atHome, slot in zip(homePattern, rotation))
+
+
+    def buildTable(self, series):
+        '''Function that returns a (teams, teams) array where entry [h][a] is the
+        probability of team h winning the series as the home team against team a'''
+
+        teams = len(self.gameProbs)
+        table = np.empty((teams, teams))
+
+        for h in range(teams):
+            for a in range(teams):
+                table[h][a] = seriesWinProbability(self.gameOdds(h, a, series))
+
+        return table
+
+
+    def winProbability(self, home, away, series):
+        '''Function that returns the probability of home winning the series against away.
+        Works on team indices or arrays of team indices'''
+
+        if series not in self.tables:
+            self.tables[series] = self.buildTable(series)
+
+        return self.tables[series][home, away]
+
+
+    def playSeries(self, home, away, series, rng):
+        '''Function that plays one series for every trial in a batch with a single uniform
+        per trial and returns an array with the index of each series winner'''
+
+        u = rng.random(len(home))
+
+        return np.where(u < self.winProbability(home, away, series), home, away)
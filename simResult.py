@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Structured result of a playoff simulation.
+
+Holds the raw counts of a run (champions, teams reaching every round, per-trial
+record) as NumPy arrays, so a simulation can run headless without pandas or
+matplotlib. Tables and plots are built from it on request (see renderSim).
+"""
+
+import numpy as np
+import teamRegistry
+from batchSim import confidenceIntervals
+
+
+class SimulationResult():
+    '''Result of one playoff simulation: the team names in engine order, the World
+    Series win count of every team and the number of trials, with the round advancement
+    counts and per-trial champion record when the engine kept them'''
+
+    def __init__(self, names, counts, trials, season = None, reached = None, rounds = None,
+                 champions = None, confidence = 0.95):
+        self.names = list(names)
+        self.counts = np.asarray(counts)
+        self.trials = trials
+        self.season = season
+        self.reached = reached                  # (rounds + 1, teams) or None
+        self.rounds = rounds                    # Row names of reached
+        self.champions = champions              # int8 champion index per trial or None
+        self.confidence = confidence
+
+
+    def winProbabilities(self):
+        '''Function that returns the World Series win probability of every team and the
+        half width of its confidence interval'''
+
+        return confidenceIntervals(self.counts, self.trials, self.confidence)
+
+
+    def teamIds(self):
+        '''Function that returns the team ID (see teamRegistry) of every team in engine order,
+        None for a name the registry does not know'''
+
+        return [teamRegistry.find(name) for name in self.names]
+
+
+    def winners(self):
+        '''Function that returns a list of (team, win count) of every team that won at
+        least one World Series, most wins first'''
+
+        order = np.argsort(-self.counts, kind = 'stable')
+
+        return [(self.names[i], int(self.counts[i])) for i in order if self.counts[i] > 0]
+
+
+    def advancementOdds(self):
+        '''Function that returns a dictionary of every round name (see
+        PlayoffSimulator.advancementRounds) and the odds of every team reaching it.
+        None if the engine did not count advancement'''
+
+        if self.reached is None:
+            return None
+
+        return {r: self.reached[i] / self.trials for i, r in enumerate(self.rounds)}
+
+
+    def toDict(self):
+        '''Function that returns the result as a dictionary of plain Python values,
+        ready to be written as JSON'''
+
+        p, width = self.winProbabilities()
+        ids = self.teamIds()
+        result = {'season': self.season, 'trials': int(self.trials), 'confidence': self.confidence,
+                  'teams': [{'team': name, 'teamId': ids[i],
+                             'code': None if ids[i] is None else teamRegistry.CODES[ids[i]],
+                             'wins': int(self.counts[i]), 'winProbability': float(p[i]),
+                             'halfWidth': float(width[i])} for i, name in enumerate(self.names)]}
+
+        advancement = self.advancementOdds()
+        if advancement is not None:
+            for i, team in enumerate(result['teams']):
+                team['advancement'] = {r: float(odds[i]) for r, odds in advancement.items()}
+
+        return result
+
+
+    def table(self):
+        '''Function that returns a pandas dataframe with the win percentage and confidence
+        interval of every team, and the odds of reaching every round when kept'''
+
+        import pandas as pd
+
+        p, width = self.winProbabilities()
+        table = pd.DataFrame({'Win %': p * 100, 'Lower %': (p - width) * 100,
+                              'Upper %': (p + width) * 100}, index = self.names)
+
+        advancement = self.advancementOdds()
+        if advancement is not None:
+            for r, odds in advancement.items():
+                table['Reach {} %'.format(r)] = odds * 100
+
+        return table
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Canonical registry of the MLB teams.
+
+Every franchise has a dense integer ID (0 to 29), its Retrosheet code (used by
+the Elo code and fullSim.py), its current name, league and division. Any alias
+resolves to the ID: Retrosheet and common codes ('LAN', 'LAD'), current and
+former names ('Cleveland Indians', 'Cleveland Guardians'), names carrying the
+postseason suffixes of the data files ('Houston Astros (W)', 'Philadelphia
+Phillies (RU)') and known typos ('San Fransisco Giants'). Lookups ignore case,
+periods and extra spaces.
+
+Engines can then key teams by ID in integer arrays, and LEAGUE and DIVISION
+give the league and division of an array of IDs by indexing.
+"""
+
+import re
+import numpy as np
+
+
+# Leagues
+AL = 0
+NL = 1
+
+# Divisions
+EAST = 0
+CENTRAL = 1
+WEST = 2
+
+LEAGUE_NAMES = ['AL', 'NL']
+DIVISION_NAMES = ['East', 'Central', 'West']
+
+# (Retrosheet code, current name, league, division, other aliases), in ID order
+TEAMS = [
+    ('ARI', 'Arizona Diamondbacks', NL, WEST, ['AZ', 'Arizona']),
+    ('ATL', 'Atlanta Braves', NL, EAST, ['Atlanta']),
+    ('BAL', 'Baltimore Orioles', AL, EAST, ['Baltimore']),
+    ('BOS', 'Boston Red Sox', AL, EAST, ['Boston']),
+    ('CHN', 'Chicago Cubs', NL, CENTRAL, ['CHC']),
+    ('CHA', 'Chicago White Sox', AL, CENTRAL, ['CHW', 'CWS']),
+    ('CIN', 'Cincinnati Reds', NL, CENTRAL, ['Cincinnati']),
+    ('CLE', 'Cleveland Guardians', AL, CENTRAL, ['Cleveland', 'Cleveland Indians']),
+    ('COL', 'Colorado Rockies', NL, WEST, ['Colorado']),
+    ('DET', 'Detroit Tigers', AL, CENTRAL, ['Detroit']),
+    ('HOU', 'Houston Astros', AL, WEST, ['Houston']),
+    ('KCA', 'Kansas City Royals', AL, CENTRAL, ['KC', 'KCR', 'Kansas City']),
+    ('ANA', 'Los Angeles Angels', AL, WEST, ['LAA', 'Anaheim Angels', 'Los Angeles Angels of Anaheim']),
+    ('LAN', 'Los Angeles Dodgers', NL, WEST, ['LAD']),
+    ('MIA', 'Miami Marlins', NL, EAST, ['FLA', 'Miami', 'Florida Marlins']),
+    ('MIL', 'Milwaukee Brewers', NL, CENTRAL, ['Milwaukee']),
+    ('MIN', 'Minnesota Twins', AL, CENTRAL, ['Minnesota']),
+    ('NYN', 'New York Mets', NL, EAST, ['NYM']),
+    ('NYA', 'New York Yankees', AL, EAST, ['NYY']),
+    ('OAK', 'Oakland Athletics', AL, WEST, ['ATH', 'Oakland', 'Athletics']),
+    ('PHI', 'Philadelphia Phillies', NL, EAST, ['Philadelphia']),
+    ('PIT', 'Pittsburgh Pirates', NL, CENTRAL, ['Pittsburgh']),
+    ('SDN', 'San Diego Padres', NL, WEST, ['SD', 'SDP', 'San Diego']),
+    ('SEA', 'Seattle Mariners', AL, WEST, ['Seattle']),
+    ('SFN', 'San Francisco Giants', NL, WEST, ['SF', 'SFG', 'San Francisco', 'San Fransisco Giants']),
+    ('SLN', 'St. Louis Cardinals', NL, CENTRAL, ['STL', 'St. Louis']),
+    ('TBA', 'Tampa Bay Rays', AL, EAST, ['TB', 'TBR', 'Tampa Bay', 'Tampa Bay Devil Rays']),
+    ('TEX', 'Texas Rangers', AL, WEST, ['Texas']),
+    ('TOR', 'Toronto Blue Jays', AL, EAST, ['Toronto']),
+    ('WAS', 'Washington Nationals', NL, EAST, ['WSH', 'WSN', 'Washington', 'Montreal Expos']),
+]
+
+CODES = [code for code, name, league, division, aliases in TEAMS]
+NAMES = [name for code, name, league, division, aliases in TEAMS]
+
+# League and division of every ID
+LEAGUE = np.array([league for code, name, league, division, aliases in TEAMS], dtype = np.int8)
+DIVISION = np.array([division for code, name, league, division, aliases in TEAMS], dtype = np.int8)
+
+# Postseason suffix of the data files: (W) World Series winner, (RU) runner up
+SUFFIX = re.compile(r'\s*\((W|RU)\)\s*$')
+
+
+def normalize(alias):
+    '''Function that returns the lookup key of an alias: no postseason suffix, periods or
+    extra spaces, case folded'''
+
+    return ' '.join(SUFFIX.sub('', alias).replace('.', ' ').split()).casefold()
+
+
+# {normalized alias: ID}
+ALIASES = {normalize(alias): i for i, (code, name, league, division, aliases) in enumerate(TEAMS)
+           for alias in [code, name] + aliases}
+
+
+def find(alias):
+    '''Function that returns the ID of a team alias, None if it is not known'''
+
+    return ALIASES.get(normalize(str(alias)))
+
+
+def teamId(alias):
+    '''Function that returns the ID of a team alias'''
+
+    i = find(alias)
+    if i is None:
+        raise ValueError('Unknown team: {}'.format(alias))
+
+    return i
+
+
+def teamIds(aliases):
+    '''Function that returns an int64 array of the IDs of a list of team aliases'''
+
+    return np.array([teamId(alias) for alias in aliases], dtype = np.int64)
+
+
+def postseasonSuffix(alias):
+    '''Function that returns the postseason suffix of a name of the data files ('W' or
+    'RU'), None if it has none'''
+
+    match = SUFFIX.search(alias)
+
+    return match.group(1) if match else None
+
+
+def divisionIds(league, division):
+    '''Function that returns the IDs of the teams of a division'''
+
+    return np.flatnonzero((LEAGUE == league) & (DIVISION == division))
+
+
+def divisionCodes(league, division):
+    '''Function that returns the tuple of the Retrosheet codes of the teams of a division'''
+
+    return tuple(CODES[i] for i in divisionIds(league, division))
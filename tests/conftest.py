@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+Shared setup of the tests: the simulation modules live at the top of the
+repository, next to the season data files the tests read.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the vectorized playoff engine against the exact bracket odds.
+"""
+
+import numpy as np
+import pytest
+import batchSim
+import exactSim
+import seasons
+from seriesTable import SeriesTable
+from conftest import ROOT
+
+
+TRIALS = 200000
+
+
+def oddsArray(names, odds):
+    '''Function that returns the exact odds of every team in engine order'''
+
+    return np.array([odds.get(name, 0.0) for name in names])
+
+
+@pytest.mark.parametrize('season', [2019, 2020, 2022])
+def test_batch_matches_exact_odds(season):
+    nl, al = seasons.loadBracket(season, ROOT)
+
+    names, counts, champions, reached = batchSim.simulateBracket(nl, al, TRIALS, seed = 1)
+    exact = oddsArray(names, exactSim.championshipOdds(nl, al))
+
+    # Every team within 5 standard errors of its exact odds
+    se = np.sqrt(exact * (1 - exact) / TRIALS)
+    assert counts.sum() == TRIALS
+    assert np.all(np.abs(counts / TRIALS - exact) <= 5 * se + 1e-12)
+
+
+def test_series_table_matches_per_game_play():
+    nl, al = seasons.loadBracket(2022, ROOT)
+    names, strength, wins = batchSim.bracketArrays(nl, al)
+    table = SeriesTable(batchSim.gameProbabilities(strength))
+    perGame = batchSim.simulateBracket(nl, al, TRIALS, seed = 2)[1] / TRIALS
+    perSeries = batchSim.simulateBracket(nl, al, TRIALS, seed = 3, table = table)[1] / TRIALS
+
+    se = np.sqrt(perGame * (1 - perGame) * 2 / TRIALS)
+    assert np.all(np.abs(perGame - perSeries) <= 5 * se + 1e-12)
+
+
+def test_seeded_runs_are_reproducible():
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    first = batchSim.simulateBracket(nl, al, 10000, seed = 5)[1]
+    second = batchSim.simulateBracket(nl, al, 10000, seed = 5)[1]
+
+    assert np.array_equal(first, second)
+
+
+def test_precision_run_stops_at_target():
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    names, counts, champions, reached, trials = batchSim.simulateToPrecision(nl, al, 0.005, maxTrials = 1000000,
+                                                                             seed = 1)
+    p, width = batchSim.confidenceIntervals(counts, trials)
+
+    assert trials < 1000000
+    assert trials % batchSim.PRECISION_BATCH == 0
+    assert width.max() <= 0.005
+
+
+def test_precision_run_stops_at_max_trials():
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    trials = batchSim.simulateToPrecision(nl, al, 1e-6, maxTrials = 150000, seed = 1)[4]
+
+    assert trials == 150000
+
+
+@pytest.mark.parametrize('maxTrials', [0, -1])
+def test_precision_run_rejects_no_trials(maxTrials):
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    with pytest.raises(ValueError):
+        batchSim.simulateToPrecision(nl, al, 0.001, maxTrials = maxTrials)
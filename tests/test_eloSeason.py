@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the vectorized Elo season engine against a game by game loop fed the
+same random numbers.
+"""
+
+import numpy as np
+import eloSeason
+import teamRegistry
+
+
+TEAMS = {'NYA': 1540, 'BOS': 1510, 'TBA': 1525, 'TOR': 1530, 'BAL': 1480}
+
+TRIALS = 200
+
+
+def schedule(games = 150, seed = 0):
+    '''Function that returns a random schedule of games between the TEAMS as (home, away) aliases'''
+
+    rng = np.random.default_rng(seed)
+    teams = list(TEAMS)
+    pairs = [rng.choice(len(teams), 2, replace = False) for g in range(games)]
+
+    return [(teams[h], teams[a]) for h, a in pairs]
+
+
+def loopSeasons(games, trials, seed):
+    '''Function that plays every season game by game with the uniforms the vectorized
+    engine draws from seed, and returns the (trials, teams) wins and final ratings'''
+
+    rng = np.random.default_rng(seed)
+    uniforms = np.concatenate([rng.random((min(eloSeason.GAME_BLOCK, len(games) - g), trials))
+                               for g in range(0, len(games), eloSeason.GAME_BLOCK)])
+
+    teams = len(teamRegistry.TEAMS)
+    wins = np.zeros((trials, teams), dtype = np.int16)
+    elo = np.full((trials, teams), np.nan)
+
+    for t in range(trials):
+        ratings = dict(TEAMS)
+        won = dict.fromkeys(TEAMS, 0)
+
+        for g, (home, away) in enumerate(games):
+            p = 1 / (1 + 10 ** ((ratings[away] - ratings[home] - eloSeason.HOME_ADVANTAGE) / 400))
+            homeWon = uniforms[g, t] < p
+            delta = eloSeason.K * (homeWon - p)
+
+            ratings[home] += delta
+            ratings[away] -= delta
+            won[home if homeWon else away] += 1
+
+        for team in TEAMS:
+            wins[t, teamRegistry.teamId(team)] = won[team]
+            elo[t, teamRegistry.teamId(team)] = ratings[team]
+
+    return wins, elo
+
+
+def test_vectorized_matches_loop():
+    games = schedule()
+    wins, elo = eloSeason.simulateSeasons(eloSeason.scheduleArrays(games), TEAMS, TRIALS, seed = 1)
+    loopWins, loopElo = loopSeasons(games, TRIALS, seed = 1)
+
+    assert np.array_equal(wins, loopWins)
+    np.testing.assert_allclose(elo, loopElo, rtol = 0, atol = 1e-9)
+
+
+def test_seeded_runs_repeat():
+    games = eloSeason.scheduleArrays(schedule())
+    first = eloSeason.runManySeasons(1000, games, TEAMS, {}, seed = 5)
+
+    assert eloSeason.runManySeasons(1000, games, TEAMS, {}, seed = 5) == first
+    assert eloSeason.runManySeasons(1000, games, TEAMS, {}, seed = 6) != first
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the full season simulation on the vectorized engine, run on a
+Retrosheet game log with the structure of the 2022 schedule.
+"""
+
+import importlib.util
+import random
+import numpy as np
+import pytest
+import eloSeason
+import fullSim
+import teamRegistry
+
+
+@pytest.fixture
+def statFile(tmp_path):
+    '''Retrosheet game log of a 162 game season: 19 games against every division rival,
+    7 against the rest of the league, 4 against the matching division of the other league'''
+
+    games = []
+    n = len(teamRegistry.TEAMS)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if teamRegistry.LEAGUE[i] == teamRegistry.LEAGUE[j]:
+                count = 19 if teamRegistry.DIVISION[i] == teamRegistry.DIVISION[j] else 7
+            else:
+                count = 4 if teamRegistry.DIVISION[i] == teamRegistry.DIVISION[j] else 0
+            games += [(i, j) if k % 2 else (j, i) for k in range(count)]
+    random.Random(2022).shuffle(games)
+
+    path = tmp_path / 'stats-2022.txt'
+    with open(path, 'w') as f:
+        for day, (home, away) in enumerate(games):
+            f.write('"2022{:04d}","0","Sat","{}","{}",0,"{}","{}",0,3,2\n'.format(
+                day // 15, teamRegistry.CODES[away], teamRegistry.LEAGUE_NAMES[teamRegistry.LEAGUE[away]],
+                teamRegistry.CODES[home], teamRegistry.LEAGUE_NAMES[teamRegistry.LEAGUE[home]]))
+
+    return str(path)
+
+
+def test_vectorized_regular_season_projections(statFile):
+    schedule = eloSeason.readSchedule(statFile)
+    teamWins = {key: 0 for key in fullSim.teamELO2022}
+    mlb = fullSim.MLBFullSeason(None, fullSim.teamELO2022, teamWins, schedule)
+
+    df = mlb.SimulateRegularSeason(2000, seed = 1)
+
+    assert len(df) == 30
+    for column in ['Predicted Wins', 'Predicted Elo', 'Wins SD', 'Elo SD',
+                   'Wins P10', 'Wins P50', 'Wins P90', 'Elo P10', 'Elo P50', 'Elo P90']:
+        assert column in df.columns
+
+    # Every game has one winner, every team plays 162 games
+    assert df['Predicted Wins'].sum() == pytest.approx(len(schedule[0]))
+    assert np.all((df['Wins P10'] <= df['Wins P50']) & (df['Wins P50'] <= df['Wins P90']))
+    assert np.all(df['Wins P90'] <= 162)
+    assert df['Predicted Wins'].is_monotonic_decreasing
+
+
+def test_vectorized_full_season(statFile):
+    winners = fullSim.runFullSeason(statFile, nTrials = 1000, playoffTrials = 10000, seed = 1)
+
+    assert len(winners) == 12
+    assert winners.sum() == 10000
+
+
+def test_game_by_game_season_names_missing_modules(statFile):
+    # The game by game engine (eloSimulation, parseText) is not part of the repository
+    if importlib.util.find_spec('parseText') is not None:
+        pytest.skip('parseText is installed')
+
+    with pytest.raises(ModuleNotFoundError, match = 'parseText'):
+        fullSim.runFullSeason(statFile, nTrials = 10, playoffTrials = 10, vectorized = False)
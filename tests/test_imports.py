@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Tests that the core modules import with NumPy alone (see benchmarks/importTime.py).
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from importTime import CORE, HEAVY
+
+
+PROBE = 'import sys, {module}; print(",".join(m for m in {heavy!r} if m in sys.modules))'
+
+
+@pytest.mark.parametrize('module', CORE)
+def test_core_module_imports_without_heavy_dependencies(module):
+    out = subprocess.run([sys.executable, '-c', PROBE.format(module = module, heavy = HEAVY)], cwd = ROOT,
+                         capture_output = True, text = True, check = True).stdout.strip()
+
+    assert out == ''
+
+
+def test_cli_imports_without_numpy():
+    out = subprocess.run([sys.executable, '-c', 'import sys, cli; print("numpy" in sys.modules)'], cwd = ROOT,
+                         capture_output = True, text = True, check = True).stdout.strip()
+
+    assert out == 'False'
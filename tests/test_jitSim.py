@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the game by game bracket kernel against the vectorized engine.
+"""
+
+import numpy as np
+import pytest
+import jitSim
+import seasons
+from conftest import ROOT
+
+
+@pytest.mark.parametrize('season', [2019, 2022])
+def test_reference_kernel_matches_batch(season):
+    # Without Numba the kernel runs uncompiled, at about 10,000 trials a second
+    nl, al = seasons.loadBracket(season, ROOT)
+    check = jitSim.equivalenceCheck(nl, al, trials = 20000, seed = 1)
+
+    assert check['equivalent']
+
+
+def test_reference_kernel_keeps_global_random_state():
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    np.random.seed(5)
+    expected = np.random.random(3)
+    np.random.seed(5)
+    jitSim.equivalenceCheck(nl, al, trials = 1000, seed = 1)
+
+    assert np.array_equal(np.random.random(3), expected)
+
+
+@pytest.mark.parametrize('season', [2019, 2022])
+def test_compiled_kernel_matches_batch(season):
+    pytest.importorskip('numba')
+
+    nl, al = seasons.loadBracket(season, ROOT)
+    check = jitSim.equivalenceCheck(nl, al, trials = 200000, seed = 1)
+
+    assert check['compiled']
+    assert check['equivalent']
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the sharded playoff simulation.
+"""
+
+import numpy as np
+import parallelSim
+import seasons
+from conftest import ROOT
+
+
+def test_single_process_run_leaves_no_state():
+    nl, al = seasons.loadBracket(2022, ROOT)
+    parallelSim.simulateParallel(nl, al, 10000, 1, seed = 1)
+
+    assert parallelSim.workerState == {}
+
+    # The next bracket is not simulated with the previous one's teams
+    nl, al = seasons.loadBracket(2019, ROOT)
+    names, counts, champions, reached = parallelSim.simulateParallel(nl, al, 10000, 1, seed = 1)
+
+    assert names == [team[0] for league in (nl, al) for s, team in sorted(league.items())]
+    assert counts.sum() == 10000
+
+
+def test_workers_are_reproducible():
+    nl, al = seasons.loadBracket(2022, ROOT)
+    first = parallelSim.simulateParallel(nl, al, 40000, 2, seed = 3, advancement = True)
+    again = parallelSim.simulateParallel(nl, al, 40000, 2, seed = 3, advancement = True)
+
+    assert np.array_equal(first[1], again[1])
+    assert np.array_equal(first[3], again[3])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the on-disk result cache: a run served from stored blocks is the same
+as a fresh run with the same seed and trials.
+"""
+
+import os
+import numpy as np
+import pytest
+import instrumentation
+import multiSeason
+import seasons
+from resultCache import ResultCache, CACHE_BLOCK
+from conftest import ROOT
+
+
+def run(cache, trials, seed = 1):
+    '''Function that runs the 2022 bracket through cache and returns the result and the
+    number of trials read from the cache'''
+
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    with instrumentation.Recorder() as recorder:
+        result = cache.simulate(nl, al, trials, seed)
+
+    return result, recorder.counters.get('cached trials', 0)
+
+
+def test_larger_request_tops_up_stored_run(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    run(cache, 150000)
+    grown, cached = run(cache, 200000)
+
+    fresh, none = run(ResultCache(str(tmp_path / 'fresh')), 200000)
+
+    assert cached == 150000
+    assert none == 0
+    assert np.array_equal(grown.counts, fresh.counts)
+    assert np.array_equal(grown.reached, fresh.reached)
+
+
+def test_smaller_request_reuses_whole_blocks(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    run(cache, 200000)
+
+    # Only the partial last block is simulated again
+    trials = 123456
+    smaller, cached = run(cache, trials)
+    fresh = run(ResultCache(str(tmp_path / 'fresh')), trials)[0]
+
+    assert cached == trials // CACHE_BLOCK * CACHE_BLOCK
+    assert smaller.counts.sum() == trials
+    assert np.array_equal(smaller.counts, fresh.counts)
+
+    # The shorter partial block does not replace the stored full one
+    again = run(ResultCache(str(tmp_path / 'again')), 200000)[0]
+    assert np.array_equal(run(cache, 200000)[0].counts, again.counts)
+
+
+def test_seed_sequence_is_cached_under_its_entropy(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    seeded = run(cache, 30000, seed = 7)[0]
+    sequence, cached = run(cache, 30000, seed = np.random.SeedSequence(7))
+
+    assert cached == 30000
+    assert np.array_equal(sequence.counts, seeded.counts)
+
+
+@pytest.mark.parametrize('seed', [np.random.SeedSequence(7).spawn(1)[0], np.random.SeedSequence([1, 2]),
+                                  np.random.default_rng(7), 1.5])
+def test_seeds_without_an_integer_key_are_refused(tmp_path, seed):
+    with pytest.raises(TypeError):
+        run(ResultCache(str(tmp_path / 'cache')), 30000, seed = seed)
+
+
+def test_unseeded_runs_are_not_stored(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    first = run(cache, 20000, seed = None)[0]
+    second, cached = run(cache, 20000, seed = None)
+
+    assert cached == 0
+    assert not np.array_equal(first.counts, second.counts)
+    assert not (tmp_path / 'cache').exists() or not os.listdir(tmp_path / 'cache')
+
+
+def test_seasons_get_their_own_seed(tmp_path):
+    nl, al = seasons.loadBracket(2022, ROOT)
+    brackets = {2021: (nl, al), 2022: (nl, al)}
+    cache = ResultCache(str(tmp_path / 'cache'))
+
+    first = multiSeason.runSeasons([2021, 2022], 20000, 1, seed = 1, brackets = brackets, cache = cache)
+    again = multiSeason.runSeasons([2021, 2022], 20000, 1, seed = 1, brackets = brackets, cache = cache)
+
+    assert not np.array_equal(first[0].counts, first[1].counts)
+    for result, rerun in zip(first, again):
+        assert np.array_equal(result.counts, rerun.counts)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the scenario comparison: common random numbers make the difference
+between scenarios far less noisy than independent runs.
+"""
+
+import copy
+import numpy as np
+import pytest
+import scenarioSim
+import seasons
+from conftest import ROOT
+
+
+TRIALS = 100000
+
+
+@pytest.mark.parametrize('antithetic', [False, True])
+def test_common_random_numbers_reduce_variance(antithetic):
+    nl, al = seasons.loadBracket(2022, ROOT)
+
+    # Top NL seed with a better #1 starter
+    better = copy.deepcopy(nl)
+    better[1][1] += 2
+
+    scenarios = [(nl, al), (nl, al), (better, al)]
+    names, odds, difference, stdError = scenarioSim.compareScenarios(scenarios, TRIALS, seed = 1,
+                                                                      antithetic = antithetic)
+
+    # The same scenario replays the same trials
+    assert np.array_equal(odds[1], odds[0])
+    assert not difference[1].any() and not stdError[1].any()
+
+    # Standard error of the difference of two independent runs
+    independent = np.sqrt((odds[0] * (1 - odds[0]) + odds[2] * (1 - odds[2])) / TRIALS)
+    tested = independent > 0
+    assert np.all(stdError[2][tested] < 0.75 * independent[tested])
+    team = names.index('Los Angeles Dodgers')
+    assert difference[2][team] > 5 * stdError[2][team]
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the season bundle: it holds what parsing the files gives, and is
+rebuilt when the content of a file changes, not when a file is only touched.
+"""
+
+import os
+import shutil
+import pytest
+import seasonBundle
+import seasonData
+import seasons
+from conftest import ROOT
+
+
+SEASONS = [2021, 2022]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    '''Data directory holding a copy of the files of SEASONS'''
+
+    for season in SEASONS:
+        for path in seasons.seasonFiles(season, ROOT):
+            shutil.copy(path, tmp_path)
+
+    return str(tmp_path)
+
+
+def test_bundle_matches_parsed_files(directory):
+    bundle = seasonBundle.openBundle(directory)
+
+    assert seasonBundle.isCurrent(directory)
+    for season in SEASONS:
+        assert bundle.teams(season) == seasonData.loadSeason(*seasons.seasonFiles(season, directory)).teams()
+
+
+def test_touch_does_not_rebuild(directory):
+    seasonBundle.openBundle(directory)
+    arrayPath = seasonBundle.bundlePaths(directory)[0]
+    built = os.stat(arrayPath).st_mtime_ns
+
+    wins = seasons.seasonFiles(2022, directory)[1]
+    stat = os.stat(wins)
+    os.utime(wins, ns = (stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert seasonBundle.isCurrent(directory)
+    seasonBundle.openBundle(directory)
+    assert os.stat(arrayPath).st_mtime_ns == built
+
+
+def test_content_change_rebuilds(directory):
+    seasonBundle.openBundle(directory)
+
+    # Same size, different wins
+    wins = seasons.seasonFiles(2022, directory)[1]
+    with open(wins) as f:
+        text = f.read()
+    with open(wins, 'w') as f:
+        f.write(text.replace('Atlanta Braves, 101', 'Atlanta Braves, 100'))
+
+    assert not seasonBundle.isCurrent(directory)
+    teams = seasonBundle.openBundle(directory).teams(2022)
+    assert teams['Atlanta Braves'][-1] == 100
+    assert seasonBundle.isCurrent(directory)
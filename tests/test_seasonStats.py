@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the streaming season statistics against the same seasons kept in
+memory.
+"""
+
+import numpy as np
+import eloSeason
+import teamRegistry
+from seasonStats import SeasonStats
+
+
+TEAMS = {'NYA': 1554, 'BOS': 1530, 'TBA': 1531, 'TOR': 1553, 'BAL': 1430, 'HOU': 1544}
+
+# More seasons than a chunk, so the moments are merged across chunks
+TRIALS = eloSeason.SEASON_CHUNK + 10000
+
+
+def schedule(games = 120, seed = 0):
+    '''Function that returns the home and away team ID arrays of a random schedule of
+    games between the TEAMS'''
+
+    rng = np.random.default_rng(seed)
+    ids = teamRegistry.teamIds(list(TEAMS))
+    pairs = np.array([rng.choice(ids, 2, replace = False) for g in range(games)])
+
+    return pairs[:, 0], pairs[:, 1]
+
+
+def test_stats_match_stored_seasons():
+    games = schedule()
+    ids = teamRegistry.teamIds(list(TEAMS))
+
+    stats = eloSeason.seasonStats(games, TEAMS, TRIALS, seed = 3)
+    wins, elo = eloSeason.simulateSeasons(games, TEAMS, TRIALS, seed = 3)
+    wins, elo = wins[:, ids], elo[:, ids]
+
+    assert stats.count == TRIALS
+    np.testing.assert_allclose(stats.winsMean, wins.mean(axis = 0), rtol = 1e-12)
+    np.testing.assert_allclose(stats.eloMean, elo.mean(axis = 0), rtol = 1e-12)
+    np.testing.assert_allclose(stats.winsVariance(), wins.var(axis = 0, ddof = 1), rtol = 1e-9)
+    np.testing.assert_allclose(stats.eloVariance(), elo.var(axis = 0, ddof = 1), rtol = 1e-9)
+
+    # Win percentiles are exact, rating percentiles exact to a bin
+    percentiles = (10, 50, 90)
+    assert np.array_equal(stats.winsPercentiles(percentiles),
+                          np.percentile(wins, percentiles, axis = 0, method = 'inverted_cdf').T)
+    exact = np.percentile(elo, percentiles, axis = 0, method = 'inverted_cdf').T
+    assert np.all(np.abs(stats.eloPercentiles(percentiles) - exact) <= stats.eloBin / 2 + 1e-9)
+
+    distribution = stats.winDistribution()
+    np.testing.assert_allclose(distribution.sum(axis = 1), 1)
+    assert np.allclose(distribution @ np.arange(distribution.shape[1]), stats.winsMean)
+
+
+def test_update_with_no_seasons():
+    stats = SeasonStats(['NYA'], [1554], 10)
+    stats.update(np.zeros((1, 0), dtype = np.int16), np.zeros((1, 0)))
+
+    assert stats.count == 0